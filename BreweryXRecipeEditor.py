@@ -1,8 +1,23 @@
 import os
-import json
+import sqlite3
 import tkinter as tk
-from tkinter import ttk, messagebox, simpledialog, colorchooser
-from PIL import Image, ImageTk
+from tkinter import ttk, messagebox, simpledialog, colorchooser, filedialog
+from catalog import available_versions, get_catalog_service, is_vanilla_name
+from collisions import RecipeIndex
+from history import RecipeHistory
+from journal import AutosaveJournal, discard as discard_journals, recover as recover_journals
+from library import RecipeLibrary
+from config_import import ConfigImportError, iter_config_recipes
+from icons import ItemIconLoader, decode_image, effect_icons
+from localization import DEFAULT_LOCALE, LOCALE_ENV, _, get_locale, set_locale
+from profiling import profile_from_env
+from recipe import POTION_EFFECTS, Effect, Ingredient, Recipe, recipe_to_yaml
+from search import NGramIndex
+from validation import RecipeValidator
+from widgets import Heatmap, IncrementalTree, SearchScheduler, VirtualList, YamlPreview, run_in_background
+
+# Recipes listed at once in the library window.
+LIBRARY_ROWS = 1000
 
 ###############################################
 # Custom dialog for entering a drink name with
@@ -11,11 +26,16 @@ from PIL import Image, ImageTk
 class NameDialog:
     def __init__(self, parent, GoodOrBad):
         self.top = tk.Toplevel(parent)
-        self.top.title("Enter Drink Name")
+        self.top.title(_("Enter Drink Name"))
         self.top.grab_set()
         self.result = None
 
-        tk.Label(self.top, text="Enter the bad variant drink name:" if GoodOrBad=="bad" else "Enter the bad variant drink name:").pack(pady=5) if GoodOrBad != "regular" else tk.Label(self.top, text="Enter the regular variant drink name").pack(pady=5)
+        prompt = {
+            "bad": _("Enter the bad variant drink name:"),
+            "regular": _("Enter the regular variant drink name:"),
+            "good": _("Enter the good variant drink name:"),
+        }.get(GoodOrBad, _("Enter the drink name:"))
+        tk.Label(self.top, text=prompt).pack(pady=5)
         self.entry = tk.Entry(self.top, width=40)
         self.entry.pack(pady=5)
 
@@ -58,13 +78,13 @@ class NameDialog:
             btn = tk.Button(btn_frame, text=code, fg=color, command=lambda c=code: self.insert_color_code(c))
             btn.pack(side="left", padx=2)
 
-        btn = tk.Button(btn_frame, text="Custom", command=lambda: self.custom_color_code())
+        btn = tk.Button(btn_frame, text=_("Custom"), command=lambda: self.custom_color_code())
         btn.pack(side="left", padx=2)
 
         # OK and Cancel buttons.
-        ok_btn = tk.Button(self.top, text="OK", command=self.on_ok)
+        ok_btn = ttk.Button(self.top, text=_("OK"), command=self.on_ok)
         ok_btn.pack(pady=5)
-        cancel_btn = tk.Button(self.top, text="Cancel", command=self.top.destroy)
+        cancel_btn = ttk.Button(self.top, text=_("Cancel"), command=self.top.destroy)
         cancel_btn.pack(pady=5)
 
     def insert_color_code(self, code):
@@ -72,8 +92,9 @@ class NameDialog:
         self.entry.insert(tk.INSERT, code)
 
     def custom_color_code(self):
-        grr, c = colorchooser.askcolor()
-        self.insert_color_code("&" + c)
+        rgb, color = colorchooser.askcolor(title=_("Choose a custom color"))
+        if color:
+            self.insert_color_code("&" + color.removeprefix("#"))
 
     def on_ok(self):
         self.result = self.entry.get()
@@ -83,62 +104,179 @@ class NameDialog:
 # Treeview-based item selector for ingredients.
 ###############################################################
 class ItemSelector(ttk.Frame):
-    def __init__(self, parent, items, select_callback, *args, **kwargs):
+    # Catalogs at least this large are shown in a VirtualList instead of a
+    # Treeview (virtual=None); pass virtual=True/False to force either one.
+    VIRTUAL_LIST_THRESHOLD = 10000
+    # A search shows only this many of the best matches.
+    MAX_RESULTS = 200
+
+    def __init__(self, parent, items, select_callback, *args, index=None, by_id=None, virtual=None, **kwargs):
         super().__init__(parent, *args, **kwargs)
         self.parent = parent
         self.items = items
+        self.index = index
+        self.by_id = by_id
+        self.virtual = virtual
         self.select_callback = select_callback
-        self.image_cache = {}
+        # Item icons are decoded in the background for the rows on screen only.
+        self.icons = ItemIconLoader(self, self.on_icons_ready, self.on_icon_evicted)
+        self.icon_rows = {}
+        self.icon_request = None
 
         self.search_var = tk.StringVar()
-        self.search_var.trace_add("write", self.update_filter)
+        # Ranked top-k results can't be narrowed for a longer term, so every
+        # search starts from the index.
+        self.search = SearchScheduler(self, self.search_var, self.search_items, self.show_matches, refine=False)
         search_entry = tk.Entry(self, textvariable=self.search_var)
         search_entry.pack(fill="x", padx=5, pady=5)
 
-        self.tree = ttk.Treeview(self, columns=("Name",), show="tree")
-        self.tree.pack(fill="both", expand=True, padx=5, pady=5)
-
-        vsb = ttk.Scrollbar(self, orient="vertical", command=self.tree.yview)
-        vsb.place(relx=1, rely=0, relheight=1, anchor="ne")
-        self.tree.configure(yscrollcommand=vsb.set)
+        self.tree = None
+        self.loading = self.items is None
+        if self.loading:
+            # The shared catalog is still loading; show a placeholder and
+            # let set_items() build the list once it arrives.
+            self.items = ()
+            self.loading_label = ttk.Label(self, text=_("Loading items..."))
+            self.loading_label.pack(fill="both", expand=True, padx=5, pady=5)
+        else:
+            self.build_view()
+            self.populate_tree(self.items)
+
+    def build_view(self):
+        virtual = self.virtual
+        if virtual is None:
+            virtual = len(self.items) >= self.VIRTUAL_LIST_THRESHOLD
+        if virtual:
+            self.tree = VirtualList(self, self.describe_item, on_view_change=self.request_visible_icons)
+            self.tree.pack(fill="both", expand=True, padx=5, pady=5)
+            self.rows = self.tree
+        else:
+            self.tree = ttk.Treeview(self, columns=("Name",), show="tree")
+            self.tree.pack(fill="both", expand=True, padx=5, pady=5)
+
+            self.vsb = ttk.Scrollbar(self, orient="vertical", command=self.tree.yview)
+            self.vsb.place(relx=1, rely=0, relheight=1, anchor="ne")
+            self.tree.configure(yscrollcommand=self.on_tree_scroll)
+            self.rows = IncrementalTree(self.tree, self.insert_item_row)
 
         self.tree.bind("<Double-1>", self.on_item_double_click)
-        self.populate_tree(self.items)
+
+    def set_items(self, items, index=None, by_id=None, keep_rows=False):
+        # keep_rows: ids still name the same records (another version of the
+        # same catalog), so rows already in the tree can be reused.
+        self.items = items
+        self.index = index
+        self.by_id = by_id
+        if self.loading:
+            self.loading_label.destroy()
+            self.build_view()
+        elif not keep_rows:
+            self.rows.reset()
+            self.icon_rows = {}
+        self.loading = False
+        self.search.reset()
+        self.update_filter()
 
     def populate_tree(self, items):
-        for row in self.tree.get_children():
-            self.tree.delete(row)
-        for item in items:
-            name = item.get("name", "Unknown")
-            item_id = item.get("id", "")
-            #image = self.load_image_for_item(name)
-            self.tree.insert("", "end", iid=item_id, text=name) #image=image)
-
-    # def load_image_for_item(self, name):
-    #     if name in self.image_cache:
-    #         return self.image_cache[name]
-    #     image_path = os.path.join("item_images", f"{name}.png")
-    #     if os.path.exists(image_path):
-    #         try:
-    #             pil_img = Image.open(image_path)
-    #             pil_img = pil_img.resize((32, 32), Image.ANTIALIAS)
-    #             photo = ImageTk.PhotoImage(pil_img)
-    #             self.image_cache[name] = photo
-    #             return photo
-    #         except Exception as e:
-    #             print(f"Error loading image for {name}: {e}")
-    #     return None
+        # Rows are created once and then only detached/reattached.
+        self.rows.show({item.get("id", ""): item for item in items})
+
+    def insert_item_row(self, item_id, index, item):
+        text, image = self.describe_item(item_id, item)
+        if image:
+            self.tree.insert("", index, iid=item_id, text=text, image=image)
+            self.icon_rows.setdefault(item.get("name", "Unknown"), set()).add(item_id)
+        else:
+            self.tree.insert("", index, iid=item_id, text=text)
+
+    def describe_item(self, item_id, item):
+        # Rows show the translated name, if the locale has one, before the id.
+        return get_locale().item_label(item), self.load_image_for_item(item.get("name", "Unknown"))
+
+    def load_image_for_item(self, name):
+        # Only returns icons that are already decoded; request_visible_icons
+        # queues the missing ones.
+        return self.icons.get(name)
+
+    def lookup(self, item_id):
+        if self.by_id is None:
+            self.by_id = {item.get("id"): item for item in self.items}
+        return self.by_id.get(item_id)
+
+    def visible_rows(self):
+        if isinstance(self.tree, VirtualList):
+            return self.tree.visible_iids()
+        rows = []
+        iid = self.tree.identify_row(1)
+        while iid and self.tree.bbox(iid):
+            rows.append(iid)
+            iid = self.tree.next(iid)
+        return rows
+
+    def on_tree_scroll(self, first, last):
+        self.vsb.set(first, last)
+        if self.icons.enabled and self.icon_request is None:
+            self.icon_request = self.after_idle(self.request_visible_icons)
+
+    def request_visible_icons(self):
+        self.icon_request = None
+        if not self.icons.enabled or self.tree is None:
+            return
+        rows = self.visible_rows()
+        self.icons.request([self.lookup(iid).get("name", "Unknown") for iid in rows])
+        if not isinstance(self.tree, VirtualList):
+            self.apply_icons(rows)
+
+    def apply_icons(self, rows):
+        # Give visible Treeview rows the icons that are decoded by now.
+        for iid in rows:
+            name = self.lookup(iid).get("name", "Unknown")
+            image = self.icons.get(name)
+            if image:
+                self.tree.item(iid, image=image)
+                self.icon_rows.setdefault(name, set()).add(iid)
+
+    def on_icons_ready(self, names):
+        if isinstance(self.tree, VirtualList):
+            self.tree.refresh()
+        else:
+            self.apply_icons(self.visible_rows())
+
+    def on_icon_evicted(self, name):
+        for iid in self.icon_rows.pop(name, ()):
+            if self.tree.exists(iid):
+                self.tree.item(iid, image="")
 
     def update_filter(self, *args):
-        term = self.search_var.get().lower()
-        filtered = [item for item in self.items if term in item.get("name", "").lower()]
-        self.populate_tree(filtered)
+        # Filters right away; typing goes through the debounced scheduler.
+        if self.loading:
+            return
+        self.search.run_now()
+
+    def search_items(self, term):
+        if self.loading:
+            return ()
+        if not term:
+            # Every record, except those the catalog's version lacks.
+            return range(len(self.items)) if self.index is None else self.index.search(term)
+        if self.index is None:
+            self.index = NGramIndex.for_items(self.items, get_locale().item_search_key)
+        # Ranks name, displayName and translated name matches (typos
+        # included) through the n-gram index.
+        return self.index.rank(term, self.MAX_RESULTS)
+
+    def show_matches(self, positions):
+        # Typing before the catalog arrives: there is no list to fill yet,
+        # and set_items() filters by the search box once there is.
+        if self.loading:
+            return
+        self.populate_tree([self.items[i] for i in positions])
 
     def on_item_double_click(self, event):
         selected_id = self.tree.focus()
         if not selected_id:
             return
-        selected_item = next((item for item in self.items if item.get("id") == selected_id), None)
+        selected_item = self.lookup(selected_id)
         if selected_item:
             self.select_callback(selected_item)
 
@@ -147,50 +285,12 @@ class PotionEffectSelector(ttk.Frame):
         super().__init__(parent, *args, **kwargs)
         self.select_callback = select_callback
 
-        self.effects = [
-            "ABSORPTION",
-            "BAD_OMEN",
-            "BLINDNESS",
-            "CONDUIT_POWER",
-            "DARKNESS",
-            "DOLPHINS_GRACE",
-            "FIRE_RESISTANCE",
-            "GLOWING",
-            "HASTE",
-            "HEALTH_BOOST",
-            "HERO_OF_THE_VILLAGE",
-            "HUNGER",
-            "INFESTED",
-            "INSTANT_DAMAGE",
-            "INSTANT_HEALTH",
-            "INVISIBILITY",
-            "JUMP_BOOST",
-            "LEVITATION",
-            "LUCK",
-            "MINING_FATIGUE",
-            "NAUSEA",
-            "NIGHT_VISION",
-            "OOZING",
-            "POISON",
-            "RAID_OMEN",
-            "REGENERATION",
-            "RESISTANCE",
-            "SATURATION",
-            "SLOW_FALLING",
-            "SLOWNESS",
-            "SPEED",
-            "STRENGTH",
-            "TRIAL_OMEN",
-            "UNLUCK",
-            "WATER_BREATHING",
-            "WEAKNESS",
-            "WEAVING",
-            "WIND_CHARGED",
-            "WITHER"
-        ]
+        self.effects = list(POTION_EFFECTS)
+        # Names and search keys in the active language, computed when it was loaded.
+        self.locale = get_locale()
 
         self.search_var = tk.StringVar()
-        self.search_var.trace_add("write", self.update_filter)
+        self.search = SearchScheduler(self, self.search_var, self.search_effects, self.populate_tree)
         search_entry = tk.Entry(self, textvariable=self.search_var)
         search_entry.pack(fill="x", padx=5, pady=5)
 
@@ -202,91 +302,237 @@ class PotionEffectSelector(ttk.Frame):
         self.tree.configure(yscrollcommand=vsb.set)
 
         self.tree.bind("<Double-1>", self.on_item_double_click)
+        self.rows = IncrementalTree(self.tree, self.insert_effect_row)
         self.populate_tree(self.effects)
 
     def load_image_for_item(self, effect):
-        image_path = os.path.join(os.path.dirname(__file__), "effects", f"{effect.lower()}.png")
-        if os.path.exists(image_path):
-            try:
-                pil_img = Image.open(image_path)
-                photo = ImageTk.PhotoImage(pil_img)
-                return photo
-            except Exception as e:
-                print(f"Error loading image for {effect}: {e}")
+        # Icons are decoded once per Tk root and shared by every selector.
+        return effect_icons(self).get(effect)
 
     def populate_tree(self, effects):
-        for row in self.tree.get_children():
-            self.tree.delete(row)
-        for effect in effects:
-            image = self.load_image_for_item(effect)
-            if image:
-                self.tree.insert("", "end", iid=effect, text=effect, image=image)
-            else:
-                self.tree.insert("", "end", iid=effect, text=effect)
+        self.rows.show(dict.fromkeys(effects))
+
+    def insert_effect_row(self, effect, index, value):
+        text = self.locale.effect_name(effect)
+        image = self.load_image_for_item(effect)
+        if image:
+            self.tree.insert("", index, iid=effect, text=text, image=image)
+        else:
+            self.tree.insert("", index, iid=effect, text=text)
 
     def update_filter(self, *args):
-        term = self.search_var.get().lower()
-        filtered = [e for e in self.effects if term in e.lower()]
-        self.populate_tree(filtered)
+        self.search.run_now()
+
+    def search_effects(self, term, candidates):
+        effects = self.effects if candidates is None else candidates
+        keys = self.locale.effect_keys
+        return [e for e in effects if term in keys[e]]
 
     def on_item_double_click(self, event):
         selected_id = self.tree.focus()
         if not selected_id:
             return
         effect = selected_id
-        level = simpledialog.askstring("Effect Level", f"Enter the {effect} level (default 1) (eg 2 or 1-3 (1 for the worst version, 3 for the best):", initialvalue=1)
+        effect_name = self.locale.effect_name(effect)
+        level = simpledialog.askstring(_("Effect Level"), _("Enter the {effect} level (default 1) (eg 2 or 1-3 (1 for the worst version, 3 for the best):").format(effect=effect_name), initialvalue=1)
         if level is None:
             return
-        duration = simpledialog.askstring("Effect Duration", f"Enter {effect}'s duration (in seconds) (eg 10 or 10-50 (10 for the worst version, 50 for the best)):", initialvalue=30)
+        duration = simpledialog.askstring(_("Effect Duration"), _("Enter {effect}'s duration (in seconds) (eg 10 or 10-50 (10 for the worst version, 50 for the best)):").format(effect=effect_name), initialvalue=30)
         if duration is None:
             return
         self.select_callback(effect, level, duration)
 
+###############################################################
+# Form for the names and single-value fields of a recipe.
+###############################################################
+class RecipeForm(ttk.Frame):
+    def __init__(self, parent, recipe, on_change, *args, **kwargs):
+        # on_change(merge, **fields) receives every field as soon as it is
+        # edited; merge is True for typing, which undo treats as one step.
+        super().__init__(parent, *args, **kwargs)
+        self.on_change = on_change
+        self.loading = False
+        self.row = 0
+
+        self.name_vars = []
+        for position, label in enumerate((_("Bad name"), _("Normal name"), _("Good name"))):
+            var = tk.StringVar(value=recipe.names[position] if position < len(recipe.names) else "")
+            self.add_row(label, tk.Entry(self, textvariable=var))
+            var.trace_add("write", self.on_name_change)
+            self.name_vars.append(var)
+
+        fields = (
+            ("cookingtime", _("Cooking time (minutes)")),
+            ("distillruns", _("Distill runs")),
+            ("distilltime", _("Distill time (minutes)")),
+            ("color", _("Color (hex)")),
+            ("difficulty", _("Difficulty (1-10)")),
+            ("alcohol", _("Alcohol (%, negative lessens intoxication)")),
+            ("wood", _("Barrel wood type (empty: any)")),
+            ("age", _("Aging time (years)")),
+            ("drinkmessage", _("Drink message")),
+            ("drinktitle", _("Drink title")),
+        )
+        self.vars = {}
+        for field, label in fields:
+            value = getattr(recipe, field)
+            var = tk.StringVar(value="" if value is None else str(value))
+            if field == "color":
+                entry = ttk.Frame(self)
+                tk.Entry(entry, textvariable=var).pack(side="left", fill="x", expand=True)
+                ttk.Button(entry, text=_("Pick..."), command=self.pick_color).pack(side="left", padx=2)
+            else:
+                entry = tk.Entry(self, textvariable=var)
+            self.add_row(label, entry)
+            var.trace_add("write", lambda *args, field=field: self.on_field_change(field))
+            self.vars[field] = var
+
+        self.glint_var = tk.BooleanVar(value=recipe.glint)
+        tk.Checkbutton(self, text=_("Glint (enchantment effect)"), variable=self.glint_var,
+                       command=lambda: self.on_change(False, glint=self.glint_var.get())).grid(row=self.row, column=1, sticky="w")
+        self.columnconfigure(1, weight=1)
+
+    def load(self, recipe):
+        """Show recipe's values (e.g. after an undo) without reporting them as edits."""
+        self.loading = True
+        try:
+            for var, name in zip(self.name_vars, recipe.names):
+                if var.get() != (name or ""):
+                    var.set(name or "")
+            for field, var in self.vars.items():
+                value = getattr(recipe, field)
+                text = "" if value is None else str(value)
+                if var.get().strip() != text:
+                    var.set(text)
+            self.glint_var.set(recipe.glint)
+        finally:
+            self.loading = False
+
+    def add_row(self, label, widget):
+        tk.Label(self, text=label).grid(row=self.row, column=0, sticky="w", padx=5, pady=2)
+        widget.grid(row=self.row, column=1, sticky="ew", padx=5, pady=2)
+        self.row += 1
+
+    def on_name_change(self, *args):
+        if not self.loading:
+            self.on_change(True, names=tuple(var.get() for var in self.name_vars))
+
+    def on_field_change(self, field):
+        if not self.loading:
+            self.on_change(True, **{field: self.vars[field].get().strip() or None})
+
+    def pick_color(self):
+        rgb, color = colorchooser.askcolor(title=_("Choose the brew color"))
+        if color:
+            self.vars["color"].set(color.removeprefix("#"))
+
 ###############################################################
 # Main application class.
 ###############################################################
 class BreweryRecipeGenerator():
     def __init__(self, master):
         self.master = master
-        master.title("Brewery Recipe Generator")
+        master.title(_("Brewery Recipe Generator"))
         master.geometry("600x600")
         self.master.attributes("-topmost", True)
 
-        header_path = os.path.join(os.path.dirname(__file__), '2FA', "ses.jpg")
-        if os.path.exists(header_path):
-            header_img = Image.open(header_path)
-            header_photo = ImageTk.PhotoImage(header_img)
-            header_label = tk.Label(master, image=header_photo)
-            header_label.image = header_photo  # Keep a reference!
-            header_label.pack(pady=5)
-
-        new_drink_btn = tk.Button(master, text="New Drink Recipe", command=self.new_drink_recipe)
-        new_drink_btn.pack(pady=10)
+        self.new_drink_btn = ttk.Button(master, text=_("New Drink Recipe"), command=self.new_drink_recipe)
+        self.new_drink_btn.pack(pady=10)
 
-        new_cauldron_btn = tk.Button(master, text="New Cauldron Recipe", command=self.new_cauldron_recipe)
+        new_cauldron_btn = ttk.Button(master, text=_("New Cauldron Recipe"), command=self.new_cauldron_recipe)
         new_cauldron_btn.pack(pady=10)
 
-        self.ingredients = []
+        import_config_btn = ttk.Button(master, text=_("Import config.yml"), command=self.import_config)
+        import_config_btn.pack(pady=10)
+
+        library_btn = ttk.Button(master, text=_("Recipe Library"), command=self.open_library)
+        library_btn.pack(pady=10)
+
+        self.catalog_service = get_catalog_service()
+        # Minecraft version of the last editor's ingredient list; None for the bundled catalog.
+        self.catalog_version = None
+        # Recipes being edited are journaled so a crash does not lose them.
+        self.journal = None
+        master.protocol("WM_DELETE_WINDOW", self.quit)
+        # Ingredient names are only checked once the catalog is in.
+        self.validator = RecipeValidator()
+        # Ingredient sets of the last imported config and the recipes made
+        # since, so new recipes can be checked for clashes.
+        self.recipe_index = RecipeIndex()
+        # The library file is only opened once a recipe is saved or searched.
+        self.library = None
+        self.library_server = ""
+
+        # Only the buttons are needed for the first frame; everything else
+        # is loaded once it is on screen.
+        master.after_idle(self.warm_up)
+
+    def warm_up(self):
+        # Style tweaks of the locale's layout (e.g. roomier buttons for hanzi).
+        style = ttk.Style()
+        for name, options in get_locale().styles.items():
+            style.configure(name, **options)
+        # Parse items.json/blocks.json once, in the background, while the
+        # user is still typing the drink names.
+        self.catalog_service.when_ready(self.master, self.on_catalog_loaded)
+        header_path = os.path.join(os.path.dirname(__file__), '2FA', "ses.jpg")
+        if os.path.exists(header_path):
+            run_in_background(self.master, lambda: decode_image(header_path), self.show_header)
+        self.start_autosave()
 
-    def load_items_from_json(self, file_path, prefix):
+    def start_autosave(self):
         try:
-            with open(file_path, "r") as f:
-                data = json.load(f)
-                for idx, item in enumerate(data):
-                    if "id" in item:
-                        item["id"] = f"{prefix}_{item['id']}"
-                    else:
-                        item["id"] = f"{prefix}_{idx}"
-                return data
-        except Exception as e:
-            messagebox.showerror("Error", f"Error loading {file_path}: {e}")
-            return []
-
-    def load_all_items(self):
-        items = []
-        items += self.load_items_from_json("items.json", "r1")
-        items += self.load_items_from_json("blocks.json", "r2")
-        return items
+            self.journal = AutosaveJournal.start()
+            recipes, paths = recover_journals(exclude=self.journal.path)
+        except OSError as e:
+            print(_("Autosave is off: {error}").format(error=e))
+            return
+        if recipes and messagebox.askyesno(
+                _("Restore Recipes"),
+                _("{count} unfinished recipes were saved when the editor last closed unexpectedly. Restore them?").format(count=len(recipes))):
+            for recipe in recipes:
+                self.open_recipe_editor(recipe)
+        # Restored recipes are in this session's journal now.
+        discard_journals(paths)
+
+    def quit(self):
+        if self.journal is not None:
+            self.journal.shutdown()
+        if self.library is not None:
+            self.library.close()
+        self.master.destroy()
+
+    def show_header(self, image, error):
+        if error is not None:
+            print(_("Error loading header image: {error}").format(error=error))
+            return
+        from PIL import ImageTk
+
+        header_photo = ImageTk.PhotoImage(image, master=self.master)
+        header_label = tk.Label(self.master, image=header_photo)
+        header_label.image = header_photo  # Keep a reference!
+        header_label.pack(pady=5, before=self.new_drink_btn)
+
+    def on_catalog_loaded(self, catalog):
+        if catalog.errors:
+            messagebox.showerror(_("Error"), "\n".join(catalog.errors))
+        if catalog.items:
+            self.validator = RecipeValidator(catalog.by_name)
+
+    def report_problems(self, problems, limit=20):
+        """Format validation problems for a message box, at most limit of them."""
+        lines = [str(problem) for problem in problems[:limit]]
+        if len(problems) > limit:
+            lines.append(_("... and {count} more").format(count=len(problems) - limit))
+        return "\n".join(lines)
+
+    def confirm_custom_ingredient(self, name, catalog=None):
+        # Plugin items (any namespace but minecraft:) can't be checked here.
+        if catalog is None:
+            catalog = self.catalog_service.get(timeout=0)
+        if catalog is None or not is_vanilla_name(name) or catalog.find_name(name):
+            return True
+        return messagebox.askyesno(_("Unknown Item"), _("{name} is not in the item catalog. Add it anyway?").format(name=name))
 
     def new_drink_recipe(self):
         # Use the custom NameDialog to get the drink name with color codes.
@@ -300,244 +546,546 @@ class BreweryRecipeGenerator():
         self.master.wait_window(name_dialog.top)
         goodname = name_dialog.result
         if not name:
-            messagebox.showerror("Nah", "I'd win.")
+            messagebox.showerror(_("Input Error"), _("The regular drink name can't be empty."))
             return
+        self.open_recipe_editor(Recipe(names=(badname or "", name, goodname or "")))
 
-        self.ingredients = []
-        self.potion_effects = []
-        self.lore_text_widgets = []
-        self.command_text_widgets = []
-        self.playercommand_text_widgets = []
-        all_items = self.load_all_items()
+    def open_recipe_editor(self, recipe):
+        # The recipe being edited. Every edit makes an updated copy, kept in
+        # the window's undo history and autosave journal, and the preview
+        # re-renders the fields that changed.
+        history = RecipeHistory(recipe)
+        journal_id = self.journal.open(recipe) if self.journal else None
 
-        # Create a window for ingredient selection.
+        # Create a window for editing the recipe next to its YAML preview.
         selection_window = tk.Toplevel(self.master)
-        selection_window.title("Select Ingredients")
-        selection_window.geometry("400x600")
+        selection_window.title(_("Select Ingredients"))
+        selection_window.geometry("900x600")
+
+        button_frame = ttk.Frame(selection_window)
+        button_frame.pack(side="bottom", pady=5)
+        panes = ttk.PanedWindow(selection_window, orient="horizontal")
+        panes.pack(fill="both", expand=True)
+        notebook = ttk.Notebook(panes)
+        panes.add(notebook, weight=1)
+        preview = YamlPreview(panes, indent=2)
+        panes.add(preview, weight=1)
+        preview.show(history.current)
+        # Text widgets whose lines are a list field of the recipe.
+        line_widgets = {}
+        # Undo and Redo buttons, enabled while there is a step to take.
+        history_buttons = {}
+
+        def update_history_buttons():
+            for button, enabled in ((history_buttons.get("undo"), history.can_undo),
+                                    (history_buttons.get("redo"), history.can_redo)):
+                if button is not None:
+                    button.state(["!disabled"] if enabled else ["disabled"])
+
+        def update_draft(merge=False, **changes):
+            preview.show(history.edit(merge, **changes))
+            update_history_buttons()
+            if journal_id is not None:
+                self.journal.update(journal_id, history.current)
+
+        def restore(recipe):
+            # Bring every widget back to an undone or redone snapshot.
+            if recipe is None:
+                return
+            update_history_buttons()
+            preview.show(recipe)
+            if journal_id is not None:
+                self.journal.update(journal_id, recipe)
+            form.load(recipe)
+            for field, widget in line_widgets.items():
+                lines = getattr(recipe, field)
+                if text_lines(widget) != lines:
+                    widget.delete("1.0", "end")
+                    widget.insert("1.0", "\n".join(lines))
+
+        properties_frame = ttk.Frame(notebook)
+        notebook.add(properties_frame, text=_("Properties"))
+        form = RecipeForm(properties_frame, history.current, update_draft)
+        form.pack(fill="both", expand=True, padx=5, pady=5)
 
-        notebook = ttk.Notebook(selection_window)
-        notebook.pack(fill="both", expand=True)
         ingredient_frame = ttk.Frame(notebook)
-        notebook.add(ingredient_frame, text="Ingredients")
+        notebook.add(ingredient_frame, text=_("Ingredients"))
+
+        # Ingredients must exist in the Minecraft version the recipe is for.
+        versions = [None] + available_versions()
+        version_frame = ttk.Frame(ingredient_frame)
+        version_frame.pack(fill="x", padx=5, pady=5)
+        ttk.Label(version_frame, text=_("Minecraft version:")).pack(side="left")
+        version_box = ttk.Combobox(version_frame, state="readonly", values=[_("Bundled catalog")] + versions[1:])
+        version_box.current(versions.index(self.catalog_version) if self.catalog_version in versions else 0)
+        version_box.pack(side="left", padx=5)
+        shown_catalog = {}
 
         def on_item_selected(item):
             item_name = item.get("name", "Unknown")
-            amount = simpledialog.askinteger("Amount", f"Enter the amount for {item_name}:")
-            self.ingredients.append(f"  - {item_name}/{amount}")
-            messagebox.showinfo("Ingredient Added", f"{item_name} ({amount}) added.")
+            label = get_locale().item_label(item)
+            amount = simpledialog.askinteger(_("Amount"), _("Enter the amount for {item}:").format(item=label))
+            if amount is not None:
+                update_draft(ingredients=history.current.ingredients + (Ingredient(item_name, amount),))
 
         def add_custom_item():
-            item = simpledialog.askstring("Item", f"Add a custom item in this format Brewery:ColorfulBrew/2")
-            amount = simpledialog.askinteger("Amount", f"Enter the amount for {item}:")
-            if item:
-                self.ingredients.append(f"  - {item}/{amount}")
-                messagebox.showinfo("Ingredient Added", f"{item} ({amount}) added.")
-
-        item_selector = ItemSelector(selection_window, all_items, on_item_selected)
+            item = simpledialog.askstring(_("Item"), _("Add a custom item in this format Brewery:ColorfulBrew/2"))
+            if not item or not item.strip():
+                return
+            item = item.strip()
+            if not self.confirm_custom_ingredient(item.split("/", 1)[0], shown_catalog.get("catalog")):
+                return
+            amount = simpledialog.askinteger(_("Amount"), _("Enter the amount for {item}:").format(item=item))
+            if amount is not None:
+                update_draft(ingredients=history.current.ingredients + (Ingredient(item, amount),))
+
+        item_selector = ItemSelector(ingredient_frame, None, on_item_selected)
         item_selector.pack(fill="both", expand=True)
 
+        def show_catalog(catalog, error, version):
+            if version != versions[version_box.current()]:
+                return  # another version was picked in the meantime
+            if error is not None:
+                messagebox.showerror(_("Error"), _("Can't load the items of Minecraft {version}: {error}").format(
+                    version=version, error=error), parent=selection_window)
+                return
+            previous = shown_catalog.get("catalog")
+            shown_catalog["catalog"] = catalog
+            # Versions share the base catalog's records and ids, so the
+            # selector keeps its rows and only the patched index changes.
+            item_selector.set_items(catalog.items, catalog.index, catalog.by_id,
+                                    keep_rows=previous is not None and previous.base is catalog.base)
+
+        def switch_version(event=None):
+            version = versions[version_box.current()]
+            self.catalog_version = version
+            run_in_background(item_selector, lambda: self.catalog_service.get_version(version),
+                              lambda catalog, error: show_catalog(catalog, error, version))
+
+        def on_catalog_ready(catalog):
+            if versions[version_box.current()] is None:
+                show_catalog(catalog, None, None)
+            else:
+                switch_version()
+
+        version_box.bind("<<ComboboxSelected>>", switch_version)
+        self.catalog_service.when_ready(item_selector, on_catalog_ready)
+
         potion_frame = ttk.Frame(notebook)
-        notebook.add(potion_frame, text="Potion Effects")
+        notebook.add(potion_frame, text=_("Potion Effects"))
         def on_potion_effect_selected(effect, level, duration):
-            self.potion_effects.append(f"  - {effect}/{level}/{duration}")
-            messagebox.showinfo("Potion Effect Added", f"{effect} (Level {level}, {duration}s) added.")
+            update_draft(effects=history.current.effects + (Effect(effect, level, duration),))
         potion_selector = PotionEffectSelector(potion_frame, on_potion_effect_selected)
         potion_selector.pack(fill="both", expand=True)
 
+        # Effects that are not in the list, typed as NAME/level/duration.
+        custom_effect_frame = ttk.Frame(potion_frame)
+        custom_effect_frame.pack(fill="x", padx=5, pady=5)
+        custom_effect_var = tk.StringVar()
+        tk.Label(custom_effect_frame, text=_("NAME/level/duration, comma-separated:")).pack(side="left")
+        tk.Entry(custom_effect_frame, textvariable=custom_effect_var).pack(side="left", fill="x", expand=True)
+
+        def add_custom_effects():
+            effects = [text for text in custom_effect_var.get().split(",") if text.strip()]
+            if effects:
+                update_draft(effects=history.current.effects + tuple(Effect.parse(text) for text in effects))
+                custom_effect_var.set("")
+
+        ttk.Button(custom_effect_frame, text=_("Add Custom Effects"), command=add_custom_effects).pack(side="left", padx=5)
+
+        def text_lines(widget):
+            text = widget.get("1.0", "end").strip()
+            return tuple(text.split('\n')) if text else ()
+
+        def watch_lines(widget, field):
+            # A recovered recipe comes with its lines; show them before
+            # listening, or the first keystroke would replace them all.
+            lines = getattr(history.current, field)
+            if lines:
+                widget.insert("1.0", "\n".join(lines))
+            widget.edit_modified(False)
+
+            # <<Modified>> fires once per change of the flag, so it is reset
+            # after every edit to hear about the next one.
+            def on_modified(event):
+                if widget.edit_modified():
+                    widget.edit_modified(False)
+                    update_draft(True, **{field: text_lines(widget)})
+            widget.bind("<<Modified>>", on_modified)
+            line_widgets[field] = widget
+
         # --------------------------
         # Lore Tab
         # --------------------------
         lore_frame = ttk.Frame(notebook)
-        notebook.add(lore_frame, text="Lore")
+        notebook.add(lore_frame, text=_("Lore"))
 
         # Create a container frame to hold the text areas.
         lore_container = ttk.Frame(lore_frame)
         lore_container.pack(fill="both", expand=True, padx=5, pady=5)
 
-        # Function to add a new lore text area.
         text_widget = tk.Text(lore_container, height=4, width=40)
-        text_widget.pack(pady=5)
-        self.lore_text_widgets.append(text_widget)
-
+        text_widget.pack(fill="both", expand=True, pady=5)
+        watch_lines(text_widget, "lore")
 
         # Button to show lore instructions.
         def show_lore_instructions():
-            instructions = (
+            instructions = _(
                 "Lore can follow this format:\n"
-                "This text will always be present"
-                "+ This text will be present if brew has bad quality"
-                "++ This text will be present if brew has normal quality"
+                "This text will always be present\n"
+                "+ This text will be present if brew has bad quality\n"
+                "++ This text will be present if brew has normal quality\n"
                 "+++ This text will be present if brew has good quality"
             )
-            messagebox.showinfo("Lore Formatting", instructions)
+            messagebox.showinfo(_("Lore Formatting"), instructions)
 
-        lore_instructions_button = tk.Button(lore_frame, text="Lore Instructions", command=show_lore_instructions)
+        lore_instructions_button = ttk.Button(lore_frame, text=_("Lore Instructions"), command=show_lore_instructions)
         lore_instructions_button.pack(pady=5)
 
         # --------------------------
         # Servercommand Tab
         # --------------------------
         command_frame = ttk.Frame(notebook)
-        notebook.add(command_frame, text="ServerCommand")
+        notebook.add(command_frame, text=_("ServerCommand"))
 
         # Create a container frame to hold the text areas.
         command_container = ttk.Frame(command_frame)
         command_container.pack(fill="both", expand=True, padx=5, pady=5)
 
         command_widget = tk.Text(command_container, height=4, width=40)
-        command_widget.pack(pady=5)
-        self.command_text_widgets.append(command_widget)
+        command_widget.pack(fill="both", expand=True, pady=5)
+        watch_lines(command_widget, "servercommands")
 
         # Button to show lore instructions.
         def show_command_instructions():
-            instructions = (
+            instructions = _(
                 "ServerCommands can follow this format:\n"
-                "say This will execute no matter what!"
-                "say This message will be delayed by 5 seconds! \5s"
-                "+ kill %player% # This will execute if brew quality is bad"
-                "++ heal %player% # This will execute if brew quality is normal"
+                "say This will execute no matter what!\n"
+                "say This message will be delayed by 5 seconds! /5s\n"
+                "+ kill %player% # This will execute if brew quality is bad\n"
+                "++ heal %player% # This will execute if brew quality is normal\n"
                 "+++ op %player% # This will execute if brew quality is good"
             )
-            messagebox.showinfo("Lore Formatting", instructions)
+            messagebox.showinfo(_("ServerCommand Formatting"), instructions)
 
-        server_instructions_button = tk.Button(command_frame, text="ServerCommand Instructions", command=show_command_instructions)
+        server_instructions_button = ttk.Button(command_frame, text=_("ServerCommand Instructions"), command=show_command_instructions)
         server_instructions_button.pack(pady=5)
 
         # --------------------------
         # Playercommand Tab
         # --------------------------
         playercommand_frame = ttk.Frame(notebook)
-        notebook.add(playercommand_frame, text="PlayerCommand")
+        notebook.add(playercommand_frame, text=_("PlayerCommand"))
 
         # Create a container frame to hold the text areas.
         playercommand_container = ttk.Frame(playercommand_frame)
         playercommand_container.pack(fill="both", expand=True, padx=5, pady=5)
 
         playercommand_widget = tk.Text(playercommand_container, height=4, width=40)
-        playercommand_widget.pack(pady=5)
-        self.playercommand_text_widgets.append(playercommand_widget)
+        playercommand_widget.pack(fill="both", expand=True, pady=5)
+        watch_lines(playercommand_widget, "playercommands")
 
         # Button to show lore instructions.
         def show_playercommand_instructions():
-            instructions = (
+            instructions = _(
                 "PlayerCommands can follow this format:\n"
-                "say This will execute no matter what!"
-                "say This message will be delayed by 5 seconds! \5s"
-                "+ msg Mom I'm sorry Ma"
-                "++ home"
+                "say This will execute no matter what!\n"
+                "say This message will be delayed by 5 seconds! /5s\n"
+                "+ msg Mom I'm sorry Ma\n"
+                "++ home\n"
                 "+++ kiss @e[type=Villager]"
             )
-            messagebox.showinfo("Lore Formatting", instructions)
+            messagebox.showinfo(_("PlayerCommand Formatting"), instructions)
 
-        player_instructions_button = tk.Button(playercommand_frame, text="PlayerCommand Instructions", command=show_playercommand_instructions)
+        player_instructions_button = ttk.Button(playercommand_frame, text=_("PlayerCommand Instructions"), command=show_playercommand_instructions)
         player_instructions_button.pack(pady=5)
 
         def finalize_recipe():
-            recipe = f"  name: '{badname}/{name}/{goodname}'\n  ingredients:\n" + '\n'.join(self.ingredients)
-            cooking_time = simpledialog.askinteger("Cooking Time", "Enter cooking time (in minutes):")
-            if cooking_time:
-                recipe += f"  cookingtime: {cooking_time}\n"
-            distill_runs = simpledialog.askstring("Distill Runs", "Enter number of distillation runs:")
-            if distill_runs:
-                recipe += f"  distillruns: {distill_runs}\n"
-            distill_time = simpledialog.askstring("Distill Time", "Enter distillation time (in minutes):") if distill_runs else ""
-            if distill_time:
-                recipe += f"  distilltime: {distill_time}\n"
-            rgb, color = colorchooser.askcolor()
-            if color:
-                recipe += f"  color: '{color.removeprefix('#')}'\n"
-            difficulty = simpledialog.askinteger("Difficulty", "Enter difficulty (1-10):")
-            if difficulty:
-                recipe += f"  difficulty: {difficulty}\n"
-            alcohol = simpledialog.askinteger("Alcohol Content", "Enter alcohol percentage (0-100) (negative values will lessen the intoxication):")
-            if alcohol and alcohol != 0:
-                recipe += f"  alcohol: {alcohol}\n"
-            wood = simpledialog.askstring("Wood Type", "Enter barrel's wood type (keep empty if ageable everywhere):")
-            if wood:
-                recipe += f"  wood: {wood}\n"
-            age = simpledialog.askstring("Aging Time", "Enter aging time (in years):")
-            if age:
-                recipe += f"  age: {age}\n"
-            if self.lore_text_widgets:
-                entries = []
-                for widget in self.lore_text_widgets:
-                    lore = widget.get("1.0", "end").strip()
-                    if lore:
-                        lore = lore.split('\n')
-                        for part in lore:
-                            entries.append(f"  - {part}")
-                if entries:
-                    recipe += f"  lore:\n" + '\n'.join(entries) + '\n'
-            if self.command_text_widgets:
-                entries = []
-                for widget in self.command_text_widgets:
-                    command = widget.get("1.0", "end").strip()
-                    if command:
-                        command = command.split('\n')
-                        for grr in command:
-                            entries.append(f"  - {grr}")
-                if entries:
-                    recipe += f"  servercommands:\n" + '\n'.join(entries) + '\n'
-            if self.playercommand_text_widgets:
-                entries = []
-                for widget in self.playercommand_text_widgets:
-                    command = widget.get("1.0", "end").strip()
-                    if command:
-                        command = command.split('\n')
-                        for grr in command:
-                            entries.append(f"  - {grr}")
-                if entries:
-                    recipe += f"  playercommands:\n" + '\n'.join(entries) + '\n'
-            drinkmessage = simpledialog.askstring("Drink Message", "Shows a message after drinking the brew")
-            if drinkmessage:
-                recipe += f"  drinkmessage: {drinkmessage}\n"
-            drinktitle = simpledialog.askstring("Drink Title", "Shows a title after drinking the brew")
-            if drinkmessage:
-                recipe += f"  drinktitle: {drinktitle}\n"
-            effects = simpledialog.askstring("Custom Effects", "Enter custom effects/their level/their duration (in this format(with /)) (if multiple effects, comma-separated with no spaces) (leave empty if none):")
-            glint = messagebox.askyesno("Glint", "Do you want the brew to glow ? (enchantement effect)")
-            if glint:
-                recipe += "  glint: true\n"
-            if effects:
-                effects = effects.split(",")
-                for effect in effects:
-                    self.potion_effects.append(f"  - {effect}")
-            if self.potion_effects:
-                recipe += f"  effects:\n" + '\n'.join(self.potion_effects)
+            recipe = history.current
+            name = recipe.names[1]
+            catalog = shown_catalog.get("catalog")
+            validator = self.validator
+            if catalog is not None and catalog.version is not None:
+                validator = RecipeValidator(catalog.by_name)
+            problems = validator.validate(recipe, name) + self.recipe_index.check(recipe, name)
+            if problems and not messagebox.askyesno(
+                    _("Recipe Problems"), _("{problems}\n\nShow the recipe anyway?").format(problems=self.report_problems(problems))):
+                return
+            self.recipe_index.add(recipe, name)
 
             # Display the final recipe in a new window.
-            recipe_window = tk.Toplevel(self.master)
-            recipe_window.title("New Drink Recipe")
-            recipe_window.geometry("400x500")
-            text_widget = tk.Text(recipe_window, wrap="word", height=20, width=50)
-            text_widget.insert("1.0", recipe)
-            text_widget.config(state="disabled")
-            text_widget.pack(pady=10)
-
-            def copy_to_clipboard():
-                self.master.clipboard_clear()
-                self.master.clipboard_append(recipe)
-                self.master.update()
-                messagebox.showinfo("Copied", "Recipe copied to clipboard!")
-
-            copy_button = tk.Button(recipe_window, text="Copy to Clipboard", command=copy_to_clipboard)
-            copy_button.pack(pady=5)
-            close_button = tk.Button(recipe_window, text="Close", command=recipe_window.destroy)
-            close_button.pack(pady=5)
+            self.show_recipe_window(_("New Drink Recipe"), recipe_to_yaml(recipe, indent=2), recipe)
+            close_editor()
+
+        def close_editor():
+            # Closing the window drops the draft; only a crash leaves it in the journal.
+            if journal_id is not None:
+                self.journal.close(journal_id)
             selection_window.destroy()
 
-        server_customitem_button = tk.Button(selection_window, text="Add Custom items for ingredient", command=add_custom_item)
-        server_customitem_button.pack(pady=5)
-        finalize_button = tk.Button(selection_window, text="Finalize Recipe", command=finalize_recipe)
-        finalize_button.pack(pady=5)
+        selection_window.protocol("WM_DELETE_WINDOW", close_editor)
+
+        server_customitem_button = ttk.Button(button_frame, text=_("Add Custom items for ingredient"), command=add_custom_item)
+        server_customitem_button.pack(side="left", padx=5)
+        finalize_button = ttk.Button(button_frame, text=_("Finalize Recipe"), command=finalize_recipe)
+        finalize_button.pack(side="left", padx=5)
+        history_buttons["undo"] = ttk.Button(button_frame, text=_("Undo"), command=lambda: restore(history.undo()))
+        history_buttons["undo"].pack(side="left", padx=5)
+        history_buttons["redo"] = ttk.Button(button_frame, text=_("Redo"), command=lambda: restore(history.redo()))
+        history_buttons["redo"].pack(side="left", padx=5)
+        update_history_buttons()
+        # The Text widgets keep no undo stack of their own (undo=False), so
+        # Ctrl+Z anywhere in the window steps through the recipe history.
+        for sequence, step in (("<Control-z>", history.undo), ("<Control-y>", history.redo),
+                               ("<Control-Shift-Z>", history.redo)):
+            selection_window.bind(sequence, lambda event, step=step: restore(step()))
+
+    def show_recipe_window(self, title, text, recipe=None):
+        recipe_window = tk.Toplevel(self.master)
+        recipe_window.title(title)
+        recipe_window.geometry("400x500")
+        text_widget = tk.Text(recipe_window, wrap="word", height=20, width=50)
+        text_widget.insert("1.0", text)
+        text_widget.config(state="disabled")
+        text_widget.pack(pady=10)
+
+        def copy_to_clipboard():
+            self.master.clipboard_clear()
+            self.master.clipboard_append(text)
+            self.master.update()
+            messagebox.showinfo(_("Copied"), _("Recipe copied to clipboard!"))
+
+        copy_button = ttk.Button(recipe_window, text=_("Copy to Clipboard"), command=copy_to_clipboard)
+        copy_button.pack(pady=5)
+        if recipe is not None:
+            quality_button = ttk.Button(recipe_window, text=_("Quality Map"),
+                                        command=lambda: self.show_quality_window(title, recipe))
+            quality_button.pack(pady=5)
+            library_button = ttk.Button(recipe_window, text=_("Save to Library"),
+                                        command=lambda: self.save_to_library([recipe], recipe_window))
+            library_button.pack(pady=5)
+        close_button = ttk.Button(recipe_window, text=_("Close"), command=recipe_window.destroy)
+        close_button.pack(pady=5)
+
+    def show_quality_window(self, title, recipe):
+        # NumPy is only needed for this window, so it is imported on demand.
+        try:
+            from quality import simulate
+        except ImportError:
+            messagebox.showerror(_("Quality Map"), _("The quality map needs NumPy (pip install numpy)."))
+            return
+        grid = simulate(recipe)
+        rows = "age" if len(grid.axes["age"]) > 1 else "distill"
+        row_name = {"age": _("aging years"), "distill": _("distill runs")}[rows]
+        window = tk.Toplevel(self.master)
+        window.title(_("Quality - {title}").format(title=title))
+        tk.Label(window, text=_("Brew quality by cooking minutes off (columns) and {rows} off (rows);\n"
+                                "{share:.0%} of all deviations still reach quality 6.").format(
+                                    rows=row_name, share=grid.forgiveness())).pack(padx=10, pady=5)
+        Heatmap(window, grid.table(rows, "cook").tolist(),
+                [f"{value:+d}" for value in grid.axes[rows]],
+                [f"{value:+d}" for value in grid.axes["cook"]]).pack(padx=10, pady=10)
+
+    def import_config(self):
+        path = filedialog.askopenfilename(title=_("Open BreweryX config"),
+                                          filetypes=[(_("YAML files"), "*.yml *.yaml"), (_("All files"), "*.*")])
+        if not path:
+            return
+        try:
+            source = open(path, "r", encoding="utf-8")
+        except OSError as e:
+            messagebox.showerror(_("Import Error"), f"{os.path.basename(path)}: {e}")
+            return
+
+        window = tk.Toplevel(self.master)
+        window.title(_("Recipes in {file}").format(file=os.path.basename(path)))
+        window.geometry("500x600")
+        status = tk.Label(window, text=_("Loading recipes..."))
+        status.pack(pady=5)
+        tree = ttk.Treeview(window, columns=("Name",), show="tree headings")
+        tree.heading("#0", text=_("Key"))
+        tree.heading("Name", text=_("Name"))
+        tree.pack(fill="both", expand=True, padx=5, pady=5)
+        recipes = {}
+        locations = {}
+
+        # Recipes are parsed a batch at a time between Tk events, so even a
+        # config with thousands of recipes shows up progressively.
+        pending = iter_config_recipes(source)
+
+        def validate():
+            pairs = [(locations[row], recipe) for row, recipe in recipes.items()]
+            problems = self.validator.validate_all(pairs)
+            index = RecipeIndex()
+            collisions = [collision for location, recipe in pairs for collision in index.add(recipe, location)]
+            self.recipe_index = index
+            status.config(text=_("{recipes} recipes, {problems} problems, {collisions} ingredient clashes").format(
+                recipes=len(recipes), problems=len(problems), collisions=len(collisions)))
+            if problems or collisions:
+                messagebox.showwarning(_("Recipe Problems"), self.report_problems(problems + collisions), parent=window)
+
+        def load_batch():
+            if not window.winfo_exists():
+                source.close()
+                return
+            try:
+                for row_count in range(200):
+                    key, recipe, line_number = next(pending)
+                    row = tree.insert("", "end", text=key, values=(recipe.name,))
+                    recipes[row] = recipe
+                    locations[row] = _("line {line} ({key})").format(line=line_number, key=key)
+            except StopIteration:
+                source.close()
+                validate()
+                return
+            except (ConfigImportError, UnicodeDecodeError) as e:
+                source.close()
+                status.config(text=_("{recipes} recipes (stopped at an error)").format(recipes=len(recipes)))
+                messagebox.showerror(_("Import Error"), f"{os.path.basename(path)}: {e}")
+                return
+            window.after(1, load_batch)
+
+        def on_recipe_double_click(event):
+            row = tree.focus()
+            if row in recipes:
+                self.show_recipe_window(tree.item(row, "text"), recipe_to_yaml(recipes[row], indent=2), recipes[row])
+
+        tree.bind("<Double-1>", on_recipe_double_click)
+        ttk.Button(window, text=_("Save All to Library"),
+                   command=lambda: self.save_to_library(list(recipes.values()), window)).pack(pady=5)
+        load_batch()
+
+    def get_library(self, parent=None):
+        if self.library is None:
+            try:
+                self.library = RecipeLibrary()
+            except sqlite3.Error as e:
+                messagebox.showerror(_("Recipe Library"), _("Can't open the recipe library: {error}").format(error=e),
+                                     parent=parent)
+        return self.library
+
+    def save_to_library(self, recipes, parent):
+        if not recipes:
+            return
+        server = simpledialog.askstring(_("Save to Library"), _("Server the recipes are for:"),
+                                        initialvalue=self.library_server, parent=parent)
+        if not server or not server.strip():
+            return
+        library = self.get_library(parent)
+        if library is None:
+            return
+        self.library_server = server.strip()
+        pairs = [(None, recipe) for recipe in recipes]
+        try:
+            existing = sorted(library.existing_keys(self.library_server, pairs))
+            replace = True
+            if existing:
+                shown = existing[:10] + (["..."] if len(existing) > 10 else [])
+                replace = messagebox.askyesnocancel(_("Save to Library"), _(
+                    "{server} already has recipes with these keys:\n{keys}\n\n"
+                    "Replace them? Choose No to save the new recipes under numbered keys.").format(
+                    server=self.library_server, keys="\n".join(shown)), parent=parent)
+                if replace is None:
+                    return
+            count = library.save_all(self.library_server, pairs, replace)
+        except sqlite3.Error as e:
+            messagebox.showerror(_("Recipe Library"), str(e), parent=parent)
+            return
+        messagebox.showinfo(_("Recipe Library"), _("{count} recipes saved for {server}.").format(
+            count=count, server=self.library_server), parent=parent)
+
+    def open_library(self):
+        library = self.get_library()
+        if library is None:
+            return
+        window = tk.Toplevel(self.master)
+        window.title(_("Recipe Library"))
+        window.geometry("600x600")
+
+        filter_frame = ttk.Frame(window)
+        filter_frame.pack(fill="x", padx=5, pady=5)
+        filters = {}
+        for column, (field, label) in enumerate((("ingredient", _("Ingredient")), ("effect", _("Effect")),
+                                                 ("wood", _("Wood")), ("difficulty", _("Difficulty")),
+                                                 ("server", _("Server")))):
+            ttk.Label(filter_frame, text=label).grid(row=0, column=column, sticky="w", padx=2)
+            if field == "effect":
+                widget = ttk.Combobox(filter_frame, values=("",) + POTION_EFFECTS, width=16)
+            elif field == "server":
+                widget = ttk.Combobox(filter_frame, values=[""] + library.servers(), width=12)
+            else:
+                widget = ttk.Entry(filter_frame, width=16 if field == "ingredient" else 6)
+            widget.grid(row=1, column=column, sticky="ew", padx=2)
+            filters[field] = widget
+        status = tk.Label(window)
+        status.pack(pady=5)
+        tree = ttk.Treeview(window, columns=("Server", "Name"), show="tree headings")
+        tree.heading("#0", text=_("Key"))
+        tree.heading("Server", text=_("Server"))
+        tree.heading("Name", text=_("Name"))
+        tree.pack(fill="both", expand=True, padx=5, pady=5)
+        entries = {}
+
+        def search(event=None):
+            query = {field: widget.get().strip() for field, widget in filters.items()}
+            try:
+                found = library.find(limit=LIBRARY_ROWS + 1, **query)
+            except sqlite3.Error as e:
+                messagebox.showerror(_("Recipe Library"), str(e), parent=window)
+                return
+            tree.delete(*tree.get_children())
+            entries.clear()
+            for entry in found[:LIBRARY_ROWS]:
+                row = tree.insert("", "end", text=entry.key, values=(entry.server, entry.name))
+                entries[row] = entry
+            if len(found) > LIBRARY_ROWS:
+                status.config(text=_("First {count} recipes; add filters to narrow the search.").format(count=LIBRARY_ROWS))
+            else:
+                status.config(text=_("{count} recipes").format(count=len(found)))
+
+        def on_entry_double_click(event):
+            entry = entries.get(tree.focus())
+            if entry is not None:
+                recipe = entry.recipe
+                self.show_recipe_window(entry.key, recipe_to_yaml(recipe, indent=2), recipe)
+
+        def delete_entry():
+            entry = entries.get(tree.focus())
+            if entry is None or not messagebox.askyesno(
+                    _("Recipe Library"), _("Delete {key} of {server} from the library?").format(
+                        key=entry.key, server=entry.server), parent=window):
+                return
+            try:
+                library.delete(entry.server, entry.key)
+            except sqlite3.Error as e:
+                messagebox.showerror(_("Recipe Library"), str(e), parent=window)
+                return
+            search()
+
+        tree.bind("<Double-1>", on_entry_double_click)
+        window.bind("<Return>", search)
+        ttk.Button(filter_frame, text=_("Search"), command=search).grid(row=1, column=len(filters), padx=2)
+        ttk.Button(window, text=_("Delete"), command=delete_entry).pack(pady=5)
+        search()
 
     def new_cauldron_recipe(self):
-        messagebox.showinfo("Feature Not Implemented", "New cauldron recipe feature is coming soon!")
+        messagebox.showinfo(_("Feature Not Implemented"), _("New cauldron recipe feature is coming soon!"))
 
 ###############################################################
 # Run the application.
 ###############################################################
-if __name__ == "__main__":
+def main(locale=None):
+    # The language comes from the launcher, BREWERY_LOCALE or English.
+    locale = locale or os.environ.get(LOCALE_ENV) or DEFAULT_LOCALE
+    try:
+        set_locale(locale)
+    except (OSError, ValueError) as e:
+        print(f"Error loading locale {locale}: {e}")
     root = tk.Tk()
+    # BREWERY_PROFILE=1 times every Tk callback and reports main loop stalls.
+    profile_from_env(root)
     app = BreweryRecipeGenerator(root)
-    root.mainloop()
\ No newline at end of file
+    root.mainloop()
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,373 @@
+import io
+import os
+import sys
+import json
+import shutil
+import argparse
+import tempfile
+import statistics
+import time
+import subprocess
+
+from catalog import CATALOG_SOURCES, BASE_DIR, load_all_items, load_delta, load_items_from_json, make_delta
+from library import RecipeLibrary
+from localization import DEFAULT_LOCALE, get_locale, set_locale
+from recipe import POTION_EFFECTS, Effect, Ingredient, Recipe, recipe_to_yaml, write_recipes
+from search import NGramIndex
+from widgets import IncrementalTree
+
+###############################################################
+# Benchmark suite.
+#
+#   python benchmark.py [--scales 1 10 100] [--repeat 5] [--headless] [--locale zh-CN]
+#
+# Times the catalog load and index build, switching to another
+# game version, per-keystroke search, tree population, effect
+# filtering, YAML serialization and recipe library queries on the
+# real catalog files and on synthetic copies scaled up from them.
+# The widget benchmarks use real Tk widgets when a display is
+# available (e.g. under xvfb-run) and a headless stand-in for
+# ttk.Treeview otherwise, so the search and row bookkeeping are
+# still measured on CI.
+#
+# It also imports each editor in a fresh interpreter and exits
+# with status 1 if that takes longer than IMPORT_BUDGET_MS or
+# loads PIL/NumPy, which must wait until they are needed.
+###############################################################
+
+DEFAULT_SCALES = (1, 10)
+SEARCH_TERM = "polished granite"
+# Typing, clearing and typing again in the effect selector.
+EFFECT_TERMS = ("s", "sl", "slo", "slow", "", "w", "wi", "wit", "")
+SERIALIZE_COUNTS = (1, 100, 10000)
+# Records dropped, renamed and added per source in the synthetic game version.
+VERSION_CHANGES = 50
+# The recipe library is filled with this many synthetic recipes per server.
+LIBRARY_SERVERS = ("survival", "creative", "skyblock")
+LIBRARY_RECIPES = 10000
+LIBRARY_QUERIES = (
+    {"ingredient": "exoticgarden:fruit_7"},
+    {"effect": "SPEED", "server": "creative"},
+    {"wood": 2, "difficulty": 3},
+)
+
+# Importing an editor script must stay within this budget, and must not
+# pull in modules that are only needed once the window is up.
+EDITOR_MODULES = ("BreweryXRecipeEditor", "BreweryXRecipeEditor_zh-CN")
+IMPORT_BUDGET_MS = 150
+DEFERRED_MODULES = ("PIL", "numpy")
+
+
+class HeadlessTree:
+    """The part of ttk.Treeview that IncrementalTree uses, without Tk."""
+
+    def __init__(self):
+        self.rows = {}
+        self.attached = []
+        self.attached_set = set()
+
+    def insert(self, parent, index, iid=None, **options):
+        self.rows[iid] = options
+        self.attached.insert(index, iid)
+        self.attached_set.add(iid)
+        return iid
+
+    def move(self, iid, parent, index):
+        if iid in self.attached_set:
+            self.attached.remove(iid)
+        self.attached.insert(index, iid)
+        self.attached_set.add(iid)
+
+    def detach(self, *iids):
+        detached = set(iids)
+        self.attached = [iid for iid in self.attached if iid not in detached]
+        self.attached_set -= detached
+
+    def delete(self, *iids):
+        self.detach(*iids)
+        for iid in iids:
+            self.rows.pop(iid, None)
+
+    def exists(self, iid):
+        return iid in self.rows
+
+
+def measure(function, repeat):
+    """Run function repeat times; return (median, best) seconds."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), min(times)
+
+
+def report(name, median, best, unit="ms"):
+    scale = 1000 if unit == "ms" else 1
+    print(f"{name:<48} {median * scale:10.2f} {unit} (best {best * scale:.2f})")
+
+
+def make_synthetic_sources(directory, scale):
+    """Write items.json/blocks.json scaled up scale times into directory; 1 copies the real files."""
+    for file_name, _ in CATALOG_SOURCES:
+        if scale == 1:
+            shutil.copyfile(os.path.join(BASE_DIR, file_name), os.path.join(directory, file_name))
+            continue
+        with open(os.path.join(BASE_DIR, file_name), "r", encoding="utf-8") as f:
+            data = json.load(f)
+        records = []
+        for copy in range(scale):
+            for item in data:
+                # Every field is kept, so a cold load parses as much JSON
+                # per record as it does on the real files.
+                name = item.get("name", "Unknown") if copy == 0 else f"{item.get('name', 'Unknown')}_{copy}"
+                display = item.get("displayName", name) if copy == 0 else f"{item.get('displayName', name)} {copy}"
+                records.append(dict(item, id=len(records), name=name, displayName=display))
+        with open(os.path.join(directory, file_name), "w", encoding="utf-8") as f:
+            json.dump(records, f)
+
+
+def make_synthetic_version(directory, version_dir):
+    """Write directory's sources with VERSION_CHANGES records each dropped, renamed and added."""
+    for file_name, _ in CATALOG_SOURCES:
+        with open(os.path.join(directory, file_name), "r", encoding="utf-8") as f:
+            data = json.load(f)
+        step = max(2, len(data) // VERSION_CHANGES)
+        records = [dict(item) for i, item in enumerate(data) if i % step]
+        for item in records[::step]:
+            item["displayName"] += " (renamed)"
+        records += [{"name": f"new_{file_name[:-5]}_{i}", "displayName": f"New {i}"} for i in range(VERSION_CHANGES)]
+        # Game versions renumber their ids.
+        for i, item in enumerate(records):
+            item["id"] = i
+        with open(os.path.join(version_dir, file_name), "w", encoding="utf-8") as f:
+            json.dump(records, f)
+
+
+def synthetic_recipes(count):
+    return [
+        Recipe(
+            names=(f"&7Bad Brew {i}", f"&6Brew {i}", f"&aFine Brew {i}"),
+            ingredients=(Ingredient("wheat", 3 + i % 5), Ingredient("sugar"), Ingredient(f"exoticgarden:fruit_{i % 40}", 2)),
+            cookingtime=5 + i % 10,
+            distillruns=i % 3,
+            color="C68C53",
+            difficulty=1 + i % 10,
+            alcohol=10 + i % 30,
+            wood=i % 9,
+            age=i % 4,
+            lore=("+++ &6Well brewed", f"Batch {i}"),
+            effects=(Effect("SPEED", "1-2", "30-60"), Effect("NAUSEA", "1", "10")),
+        )
+        for i in range(count)
+    ]
+
+
+def bench_catalog(directory, label, repeat):
+    sources = [os.path.join(directory, file_name) for file_name, _ in CATALOG_SOURCES]
+    report(f"{label} load_items_from_json",
+           *measure(lambda: [load_items_from_json(path, prefix)
+                             for path, (_, prefix) in zip(sources, CATALOG_SOURCES)], repeat))
+
+    cache_path = os.path.join(directory, "catalog.cache")
+
+    def cold():
+        if os.path.exists(cache_path):
+            os.remove(cache_path)
+        return load_all_items(base_dir=directory, cache_file="catalog.cache")
+
+    report(f"{label} load_all_items cold", *measure(cold, repeat))
+    cold()
+    report(f"{label} load_all_items warm",
+           *measure(lambda: load_all_items(base_dir=directory, cache_file="catalog.cache"), repeat))
+    catalog = load_all_items(base_dir=directory, cache_file="catalog.cache")
+    # Part of the cold load only; a warm load reads the index from the cache.
+    report(f"{label} Catalog index build",
+           *measure(lambda: NGramIndex.for_items(catalog.items, get_locale().item_search_key), repeat))
+    return catalog
+
+
+def bench_versions(directory, catalog, label, repeat):
+    version_dir = os.path.join(directory, "version")
+    os.makedirs(version_dir, exist_ok=True)
+    make_synthetic_version(directory, version_dir)
+    with open(os.path.join(version_dir, "bench.json"), "w", encoding="utf-8") as f:
+        json.dump(make_delta(version_dir, base_dir=directory), f)
+    report(f"{label} version by full load", *measure(lambda: load_all_items(base_dir=version_dir, cache_file=None), repeat))
+    report(f"{label} version by with_delta",
+           *measure(lambda: catalog.with_delta(load_delta("bench", version_dir)), repeat))
+
+
+def bench_search_headless(catalog, label, repeat):
+    items = catalog.items
+    rows = IncrementalTree(HeadlessTree(), lambda iid, index, item: rows.tree.insert("", index, iid=iid))
+
+    def populate():
+        rows.reset()
+        rows.show({item["id"]: item for item in items})
+
+    report(f"{label} populate full catalog (headless)", *measure(populate, repeat))
+
+    def type_term():
+        rows.show({item["id"]: item for item in items})
+        for end in range(1, len(SEARCH_TERM) + 1):
+            positions = catalog.index.rank(SEARCH_TERM[:end], 200)
+            rows.show({items[i]["id"]: items[i] for i in positions})
+
+    median, best = measure(type_term, repeat)
+    report(f"{label} filter per keystroke (headless)", median / len(SEARCH_TERM), best / len(SEARCH_TERM))
+
+
+def bench_effects_headless(label, repeat):
+    effects = list(POTION_EFFECTS)
+    keys = get_locale().effect_keys
+    rows = IncrementalTree(HeadlessTree(), lambda iid, index, _: rows.tree.insert("", index, iid=iid))
+
+    def type_term():
+        for term in EFFECT_TERMS:
+            rows.show(dict.fromkeys(e for e in effects if term in keys[e]))
+
+    median, best = measure(type_term, repeat)
+    report(f"{label} effect filter per keystroke (headless)", median / len(EFFECT_TERMS), best / len(EFFECT_TERMS))
+
+
+def bench_tk(root, catalog, label, repeat, effects=False):
+    from BreweryXRecipeEditor import ItemSelector, PotionEffectSelector
+
+    def populate():
+        selector = ItemSelector(root, catalog.items, lambda item: None,
+                                index=catalog.index, by_id=catalog.by_id)
+        root.update_idletasks()
+        return selector
+
+    report(f"{label} ItemSelector populate full catalog", *measure(lambda: populate().destroy(), repeat))
+
+    selector = populate()
+
+    def type_term():
+        for end in range(len(SEARCH_TERM) + 1):
+            selector.search_var.set(SEARCH_TERM[:end])
+            selector.update_filter()
+            root.update_idletasks()
+
+    median, best = measure(type_term, repeat)
+    report(f"{label} ItemSelector.update_filter per keystroke", median / (len(SEARCH_TERM) + 1),
+           best / (len(SEARCH_TERM) + 1))
+    selector.destroy()
+
+    if effects:
+        effect_selector = PotionEffectSelector(root, lambda *args: None)
+
+        def filter_effects():
+            for term in EFFECT_TERMS:
+                effect_selector.search_var.set(term)
+                effect_selector.update_filter()
+                root.update_idletasks()
+
+        median, best = measure(filter_effects, repeat)
+        report("PotionEffectSelector filter with icons per keystroke", median / len(EFFECT_TERMS), best / len(EFFECT_TERMS))
+        effect_selector.destroy()
+
+
+def bench_serialization(repeat):
+    for count in SERIALIZE_COUNTS:
+        recipes = synthetic_recipes(count)
+        report(f"write_recipes x{count}", *measure(lambda: write_recipes(recipes, io.StringIO()), repeat))
+    recipe = synthetic_recipes(1)[0]
+    report("recipe_to_yaml x1", *measure(lambda: recipe_to_yaml(recipe), repeat))
+
+
+def bench_library(directory, repeat):
+    recipes = [(None, recipe) for recipe in synthetic_recipes(LIBRARY_RECIPES)]
+    library = RecipeLibrary(os.path.join(directory, "library.sqlite3"))
+    try:
+        start = time.perf_counter()
+        for server in LIBRARY_SERVERS:
+            library.save_all(server, recipes)
+        elapsed = time.perf_counter() - start
+        report(f"library save_all x{len(library)}", elapsed, elapsed)
+        report(f"library update x{len(recipes) // 10}",
+               *measure(lambda: library.save_all(LIBRARY_SERVERS[0], recipes[:len(recipes) // 10]), repeat))
+        for query in LIBRARY_QUERIES:
+            label = " ".join(f"{field}={value}" for field, value in query.items())
+            report(f"library find {label}", *measure(lambda: library.find(**query), repeat))
+    finally:
+        library.close()
+
+
+def check_startup(repeat):
+    """Time importing each editor in a fresh interpreter; False if over budget."""
+    probe = ("import sys, time, importlib\n"
+             "start = time.perf_counter()\n"
+             "importlib.import_module(sys.argv[1])\n"
+             "print(time.perf_counter() - start)\n"
+             f"print(','.join(m for m in {DEFERRED_MODULES!r} if m in sys.modules))\n")
+    ok = True
+    for module in EDITOR_MODULES:
+        times = []
+        for _ in range(repeat):
+            output = subprocess.run([sys.executable, "-c", probe, module], cwd=BASE_DIR,
+                                    capture_output=True, text=True, check=True).stdout.splitlines()
+            times.append(float(output[0]))
+        report(f"import {module}", statistics.median(times), min(times))
+        loaded = output[1] if len(output) > 1 else ""
+        if statistics.median(times) * 1000 > IMPORT_BUDGET_MS:
+            print(f"  over the {IMPORT_BUDGET_MS} ms startup budget")
+            ok = False
+        if loaded:
+            print(f"  imports {loaded} at startup; it should be deferred")
+            ok = False
+    return ok
+
+
+def open_display(headless):
+    if headless:
+        return None
+    import tkinter as tk
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        print("No display; Tk widgets are replaced by a headless tree (run under xvfb-run for Tk).")
+        return None
+    root.withdraw()
+    return root
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark catalog loading, search, tree population and serialization.")
+    parser.add_argument("--scales", type=int, nargs="+", default=list(DEFAULT_SCALES),
+                        help="catalog sizes as multiples of the real one (default: 1 10)")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per benchmark; the median is reported")
+    parser.add_argument("--headless", action="store_true", help="never open a Tk window")
+    parser.add_argument("--locale", default=DEFAULT_LOCALE,
+                        help="locale whose item names and search keys are indexed (default: en)")
+    args = parser.parse_args(argv)
+    set_locale(args.locale)
+
+    startup_ok = check_startup(args.repeat)
+    root = open_display(args.headless)
+    directory = tempfile.mkdtemp(prefix="brewery-bench-")
+    try:
+        for scale in args.scales:
+            make_synthetic_sources(directory, scale)
+            label = f"{scale}x"
+            catalog = bench_catalog(directory, label, args.repeat)
+            print(f"{label} catalog: {len(catalog)} records")
+            bench_versions(directory, catalog, label, args.repeat)
+            if root is None:
+                bench_search_headless(catalog, label, args.repeat)
+                if scale == args.scales[0]:
+                    bench_effects_headless(label, args.repeat)
+            else:
+                bench_tk(root, catalog, label, args.repeat, effects=scale == args.scales[0])
+        bench_serialization(args.repeat)
+        bench_library(directory, args.repeat)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+        if root is not None:
+            root.destroy()
+    return 0 if startup_ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,166 @@
+import os
+import sys
+import csv
+import json
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple
+
+from catalog import load_all_items
+from recipe import LIST_SEPARATOR, recipe_from_dict, recipe_key, recipe_to_yaml
+from validation import RecipeValidator
+
+###############################################################
+# Headless bulk recipe compiler.
+#
+#   python brewery_compile.py recipes.csv more.jsonl -o recipes.yml
+#
+# Reads recipe specs from CSV, JSON or JSONL files, validates them
+# against items.json/blocks.json and the effect table and writes
+# one BreweryX "recipes:" section.
+###############################################################
+
+# Below this many recipes the work is done in-process; starting the pool
+# would cost more than it saves.
+POOL_THRESHOLD = 2000
+CHUNK_SIZE = 500
+
+
+class InvalidSpec(NamedTuple):
+    # Stands in for a JSONL line that does not parse; compile_spec reports it
+    # like any other bad recipe, so the rest of the file is still compiled.
+    message: str
+
+
+def read_specs(path):
+    """Yield (location, spec) for every recipe in a CSV, JSON or JSONL file.
+
+    Raises OSError or ValueError if the file can't be read at all.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if ext == ".csv":
+            # Row 1 is the header, so data rows start at line 2.
+            for row_number, row in enumerate(csv.DictReader(f), start=2):
+                yield f"{path}:{row_number}", row
+        elif ext == ".jsonl":
+            for line_number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    spec = json.loads(line)
+                except ValueError as e:
+                    spec = InvalidSpec(f"invalid JSON: {e}")
+                yield f"{path}:{line_number}", spec
+        else:
+            data = json.load(f)
+            if isinstance(data, dict):
+                # BreweryX layout: {"recipes": {key: recipe}} or just {key: recipe}.
+                data = data.get("recipes", data)
+                if not isinstance(data, dict):
+                    raise ValueError("'recipes' is not a mapping of recipe keys")
+                for key, spec in data.items():
+                    if isinstance(spec, dict):
+                        spec = dict(spec, key=spec.get("key") or key)
+                    yield f"{path}:{key}", spec
+            elif isinstance(data, list):
+                for position, spec in enumerate(data):
+                    yield f"{path}[{position}]", spec
+            else:
+                raise ValueError("expected a list or mapping of recipes")
+
+
+_validator = RecipeValidator()
+
+
+def _init_worker(validator):
+    global _validator
+    _validator = validator
+
+
+def compile_spec(job):
+    """Turn one (location, spec) pair into (location, key, yaml body, errors)."""
+    location, spec = job
+    if isinstance(spec, InvalidSpec):
+        return location, None, None, [spec.message]
+    if not isinstance(spec, dict):
+        return location, None, None, ["invalid recipe: expected an object"]
+    try:
+        recipe = recipe_from_dict(spec)
+    except Exception as e:
+        return location, None, None, [f"invalid recipe: {e}"]
+    errors = [f"{problem.field}: {problem.message}" for problem in _validator.validate(recipe, location)]
+    if errors:
+        return location, None, None, errors
+    return location, recipe_key(recipe), recipe_to_yaml(recipe, indent=4), []
+
+
+def compile_specs(jobs, validator, workers=None):
+    """Compile (location, spec) pairs, in order, using a process pool for large batches."""
+    jobs = list(jobs)
+    if workers == 1 or len(jobs) < POOL_THRESHOLD:
+        _init_worker(validator)
+        return [compile_spec(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(validator,)) as pool:
+        return list(pool.map(compile_spec, jobs, chunksize=CHUNK_SIZE))
+
+
+def write_output(results, out):
+    """Write the "recipes:" section; returns the number of recipes skipped because of errors."""
+    out.write("recipes:\n")
+    used = set()
+    failed = 0
+    for location, key, body, errors in results:
+        if errors:
+            failed += 1
+            for error in errors:
+                print(f"{location}: {error}", file=sys.stderr)
+            continue
+        base, suffix = key, 2
+        while key in used:
+            key = f"{base}_{suffix}"
+            suffix += 1
+        used.add(key)
+        out.write(f"  {key}:\n")
+        out.write(body)
+    return failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Compile recipe specs (CSV/JSON/JSONL) into a BreweryX recipes: section.",
+        epilog=f"CSV list cells (ingredients, effects, lore, ...) separate entries with '{LIST_SEPARATOR}'.")
+    parser.add_argument("inputs", nargs="+", help="recipe spec files")
+    parser.add_argument("-o", "--output", help="output file (default: stdout)")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    catalog = load_all_items()
+    for error in catalog.errors:
+        print(error, file=sys.stderr)
+    if not catalog.items:
+        return 2
+
+    jobs = []
+    for path in args.inputs:
+        try:
+            jobs += read_specs(path)
+        except json.JSONDecodeError as e:
+            print(f"{path}:{e.lineno}: invalid JSON: {e.msg}", file=sys.stderr)
+            return 2
+        except (OSError, ValueError) as e:
+            print(f"{path}: {e}", file=sys.stderr)
+            return 2
+    results = compile_specs(jobs, RecipeValidator(catalog.by_name), args.jobs)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as out:
+            failed = write_output(results, out)
+    else:
+        failed = write_output(results, sys.stdout)
+    print(f"{len(results) - failed} recipes compiled, {failed} skipped", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,453 @@
+import os
+import sys
+import json
+import pickle
+import hashlib
+import argparse
+import threading
+from collections import ChainMap
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import NamedTuple
+from localization import get_locale
+from search import NGramIndex
+
+###############################################################
+# Process-wide item/block catalog.
+#
+# items.json and blocks.json are parsed once, on a background
+# thread, and the resulting read-only catalog is handed to every
+# ItemSelector that asks for it. The parsed records and their
+# search index are cached in catalog.cache, so a warm start
+# reads one file instead.
+#
+# Other Minecraft versions are stored as deltas against these
+# files (versions/<version>.json: the records each source lost
+# and gained, by name). A version's catalog is derived from the
+# base one by patching its index and lookups, so only the base is
+# ever parsed in full and a version costs what its delta costs.
+# A delta is made from that version's minecraft-data files with
+#
+#   python catalog.py 1.20.4 path/to/minecraft-data/pc/1.20.4
+###############################################################
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# (file name, id prefix) pairs, in the order the selector lists them.
+CATALOG_SOURCES = (
+    ("items.json", "r1"),
+    ("blocks.json", "r2"),
+)
+
+# Compact, columnar copy of the sources holding only the fields the
+# selector and exporter read, plus the search index built for one locale
+# (building it is most of the cost of a load). Bump CACHE_VERSION whenever
+# the layout changes.
+CACHE_FILE = "catalog.cache"
+CACHE_VERSION = 2
+CATALOG_FIELDS = ("id", "name", "displayName", "source")
+
+VERSIONS_DIR = os.path.join(BASE_DIR, "versions")
+
+
+def normalize_name(name):
+    """Catalog lookup key for an ingredient name (e.g. 'minecraft:Sweet_Berries')."""
+    return name.strip().lower().removeprefix("minecraft:")
+
+
+def is_vanilla_name(name):
+    """Whether name refers to a vanilla material rather than a plugin item."""
+    namespace, sep, _ = name.strip().partition(":")
+    return not sep or namespace.lower() == "minecraft"
+
+
+class CatalogDelta(NamedTuple):
+    # What a game version changes in the base catalog: removed holds
+    # (source, normalized name) pairs, added the new records.
+    version: str
+    removed: frozenset
+    added: tuple
+
+
+class NameOverlay(Mapping):
+    """Read-only name lookup of a base mapping with some entries replaced; None hides a name."""
+
+    def __init__(self, base, changes):
+        self.base = base
+        self.changes = changes
+
+    def __getitem__(self, name):
+        if name in self.changes:
+            item = self.changes[name]
+            if item is None:
+                raise KeyError(name)
+            return item
+        return self.base[name]
+
+    def __iter__(self):
+        for name in self.base:
+            if name not in self.changes:
+                yield name
+        for name, item in self.changes.items():
+            if item is not None:
+                yield name
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+
+class Catalog:
+    """Immutable list of catalog records shared by every editor window.
+
+    The search index and the id/name lookups are built together with the
+    records, so a reloaded catalog always brings matching indexes with it.
+    A version catalog from with_delta() keeps the records its version lacks
+    in items, at their positions, but leaves them out of the index, the
+    lookups and iteration.
+    """
+
+    def __init__(self, items, errors=(), version=None, base=None, index=None, by_id=None, by_name=None):
+        self.items = tuple(items)
+        self.errors = tuple(errors)
+        # None for the catalog of the source files themselves.
+        self.version = version
+        self.base = base if base is not None else self
+        if index is None:
+            # Built here so it happens on the loader thread, not on a keystroke.
+            # The keys hold the active locale's item names next to the English ones.
+            index = NGramIndex.for_items(self.items, get_locale().item_search_key)
+        self.index = index
+        self.by_id = by_id if by_id is not None else MappingProxyType({item["id"]: item for item in self.items})
+        if by_name is None:
+            by_name = {}
+            for item in self.items:
+                # items.json comes first, so an item wins over a block of the same name.
+                by_name.setdefault(normalize_name(item["name"]), item)
+            by_name = MappingProxyType(by_name)
+        self.by_name = by_name
+        self._positions = None
+
+    def __len__(self):
+        return len(self.index)
+
+    def __iter__(self):
+        removed = self.index.removed
+        return (item for position, item in enumerate(self.items) if position not in removed)
+
+    def find_name(self, name):
+        """Return the record for an ingredient name, or None if it is unknown."""
+        return self.by_name.get(normalize_name(name))
+
+    def position(self, source, name):
+        """Position of the record of source (an id prefix) named name, or None."""
+        if self._positions is None:
+            # Only needed to apply deltas, so only the base catalog builds it.
+            self._positions = {(item["source"], normalize_name(item["name"])): position
+                               for position, item in enumerate(self.items)}
+        return self._positions.get((source, normalize_name(name)))
+
+    def with_delta(self, delta):
+        """Return the catalog of delta's version, derived from this one.
+
+        The index is patched and the lookups are layered over this catalog's,
+        so the cost follows the size of the delta, not of the catalog.
+        """
+        removed = {position for position in (self.position(*key) for key in delta.removed)
+                   if position is not None}
+        added = delta.added
+        index = self.index.patched(removed, [get_locale().item_search_key(item) for item in added])
+        by_id = MappingProxyType(ChainMap({item["id"]: item for item in added}, self.by_id))
+        changes = {}
+        for position in removed:
+            name = normalize_name(self.items[position]["name"])
+            # The name stays known if another source still has it.
+            changes[name] = None
+            for _, prefix in CATALOG_SOURCES:
+                other = self.position(prefix, name)
+                if other is not None and other not in removed:
+                    changes[name] = self.items[other]
+                    break
+        rank = {prefix: order for order, (_, prefix) in enumerate(CATALOG_SOURCES)}
+        for item in added:
+            name = normalize_name(item["name"])
+            # As in a full load, the record of the earliest source wins.
+            current = changes[name] if name in changes else self.by_name.get(name)
+            if current is None or rank[item["source"]] < rank[current["source"]]:
+                changes[name] = item
+        return Catalog(self.items + added, self.errors, delta.version, self, index, by_id,
+                       NameOverlay(self.by_name, changes))
+
+
+def make_record(item_id, name, display_name, source):
+    return MappingProxyType({"id": item_id, "name": name, "displayName": display_name, "source": source})
+
+
+def load_items_from_json(file_path, prefix):
+    """Parse one catalog file into read-only records with prefixed ids."""
+    with open(file_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    records = []
+    for idx, item in enumerate(data):
+        name = item.get("name", "Unknown")
+        records.append(make_record(f"{prefix}_{item.get('id', idx)}", name, item.get("displayName", name), prefix))
+    return records
+
+
+def _source_stamp(file_path, with_hash):
+    st = os.stat(file_path)
+    digest = None
+    if with_hash:
+        with open(file_path, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+    return st.st_mtime_ns, st.st_size, digest
+
+
+def _index_locale():
+    # The index keys hold translated names, so the index cached for one
+    # locale (or an older copy of its files) is no use to another.
+    locale = get_locale()
+    return locale.code, locale.stamp
+
+
+def _read_cache(cache_path, sources, base_dir):
+    """Return (records, refreshed stamps or None, index or None), or None when the cache must be rebuilt."""
+    try:
+        with open(cache_path, "rb") as f:
+            cache = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+        return None
+    if not isinstance(cache, dict) or cache.get("version") != CACHE_VERSION:
+        return None
+    stamps = cache["sources"]
+    if [(name, prefix) for name, prefix, *_ in stamps] != list(sources):
+        return None
+    stamps_changed = False
+    for i, (name, prefix, mtime_ns, size, digest) in enumerate(stamps):
+        st = os.stat(os.path.join(base_dir, name))
+        if (st.st_mtime_ns, st.st_size) == (mtime_ns, size):
+            continue
+        # The file was touched; only its content hash decides whether the
+        # parsed columns are still valid.
+        new_stamp = _source_stamp(os.path.join(base_dir, name), True)
+        if new_stamp[2] != digest:
+            return None
+        stamps[i] = (name, prefix, *new_stamp)
+        stamps_changed = True
+    columns = cache["columns"]
+    records = list(map(make_record, *(columns[field] for field in CATALOG_FIELDS)))
+    index = None
+    if cache["index_locale"] == _index_locale():
+        index = NGramIndex.load(cache["index"])
+    return (records, stamps if stamps_changed else None, index)
+
+
+def _write_cache(cache_path, sources, base_dir, records, stamps=None, index=None):
+    columns = {field: [record[field] for record in records] for field in CATALOG_FIELDS}
+    if stamps is None:
+        stamps = [(name, prefix, *_source_stamp(os.path.join(base_dir, name), True)) for name, prefix in sources]
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            pickle.dump({"version": CACHE_VERSION, "sources": stamps, "columns": columns,
+                         "index_locale": _index_locale(), "index": index.dump() if index else None}, f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        # A read-only install simply runs without the cache.
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def load_all_items(sources=CATALOG_SOURCES, base_dir=BASE_DIR, cache_file=CACHE_FILE):
+    """Load every catalog source; failures are collected instead of raised.
+
+    The compact cache next to the sources is used when it is still valid and
+    rebuilt from the JSON files otherwise; its search index is rebuilt (and
+    stored again) when the locale changed. Pass cache_file=None to bypass it.
+    """
+    cache_path = os.path.join(base_dir, cache_file) if cache_file else None
+    if cache_path:
+        try:
+            cached = _read_cache(cache_path, sources, base_dir)
+        except (OSError, KeyError, TypeError, ValueError):
+            cached = None
+        if cached is not None:
+            records, new_stamps, index = cached
+            catalog = Catalog(records, index=index)
+            if new_stamps is not None or index is None:
+                _write_cache(cache_path, sources, base_dir, records, new_stamps, catalog.index)
+            return catalog
+
+    items = []
+    errors = []
+    for file_name, prefix in sources:
+        file_path = os.path.join(base_dir, file_name)
+        try:
+            items += load_items_from_json(file_path, prefix)
+        except Exception as e:
+            errors.append(f"Error loading {file_path}: {e}")
+    catalog = Catalog(items, errors)
+    if cache_path and not errors:
+        _write_cache(cache_path, sources, base_dir, items, index=catalog.index)
+    return catalog
+
+
+def available_versions(directory=VERSIONS_DIR):
+    """Names of the versions with a delta file, sorted."""
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return []
+    return sorted(name[:-len(".json")] for name in names if name.endswith(".json"))
+
+
+def load_delta(version, directory=VERSIONS_DIR, sources=CATALOG_SOURCES):
+    """Read versions/<version>.json into a CatalogDelta.
+
+    The file holds, per source file, the names removed from it and the
+    records added to it:
+    {"removed": {"items.json": ["name", ...]}, "added": {"items.json": [{"id": 5, "name": ..., "displayName": ...}]}}
+    """
+    with open(os.path.join(directory, f"{version}.json"), "r", encoding="utf-8") as f:
+        data = json.load(f)
+    removed = set()
+    added = []
+    for file_name, prefix in sources:
+        removed.update((prefix, normalize_name(name)) for name in data.get("removed", {}).get(file_name, ()))
+        for idx, item in enumerate(data.get("added", {}).get(file_name, ())):
+            name = item.get("name", "Unknown")
+            # Ids are renumbered between versions, so added records get ids of their own.
+            added.append(make_record(f"{prefix}_{version}_{item.get('id', idx)}", name,
+                                     item.get("displayName", name), prefix))
+    return CatalogDelta(version, frozenset(removed), tuple(added))
+
+
+def make_delta(version_dir, base_dir=BASE_DIR, sources=CATALOG_SOURCES):
+    """Delta file contents turning the base source files into those in version_dir.
+
+    Records are matched by name; a record whose displayName changed is
+    removed and added again.
+    """
+    removed, added = {}, {}
+    for file_name, _ in sources:
+        with open(os.path.join(base_dir, file_name), "r", encoding="utf-8") as f:
+            base = {item.get("name"): item.get("displayName", item.get("name")) for item in json.load(f)}
+        with open(os.path.join(version_dir, file_name), "r", encoding="utf-8") as f:
+            items = json.load(f)
+        names = {item.get("name") for item in items}
+        removed[file_name] = [name for name in base if name not in names]
+        added[file_name] = []
+        for item in items:
+            name = item.get("name")
+            if name not in base or base[name] != item.get("displayName", name):
+                if name in base:
+                    removed[file_name].append(name)
+                added[file_name].append({"id": item.get("id"), "name": name,
+                                         "displayName": item.get("displayName", name)})
+    return {"removed": removed, "added": added}
+
+
+class CatalogService:
+    """Loads the catalog once per process on a daemon thread."""
+
+    def __init__(self, loader=load_all_items):
+        self._loader = loader
+        self._lock = threading.Lock()
+        self._loaded = threading.Event()
+        self._thread = None
+        self._catalog = None
+        self._deltas = {}
+        # Only the last version catalog is kept; the deltas are small.
+        self._version_catalog = None
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="catalog-loader", daemon=True)
+                self._thread.start()
+        return self
+
+    def _run(self):
+        try:
+            catalog = self._loader()
+        except Exception as e:
+            catalog = Catalog((), [f"Error loading catalog: {e}"])
+        self._catalog = catalog
+        self._loaded.set()
+
+    @property
+    def ready(self):
+        return self._loaded.is_set()
+
+    def get(self, timeout=None):
+        """Block until the catalog is loaded (starting the loader if needed)."""
+        self.start()
+        if not self._loaded.wait(timeout):
+            return None
+        return self._catalog
+
+    def when_ready(self, widget, callback, poll_ms=50):
+        # Tk is not thread-safe, so the loader thread never touches widgets;
+        # instead the Tk thread polls the event and runs the callback itself.
+        self.start()
+
+        def poll():
+            if not widget.winfo_exists():
+                return
+            if self.ready:
+                callback(self._catalog)
+            else:
+                widget.after(poll_ms, poll)
+
+        poll()
+
+    def get_version(self, version):
+        """Return the catalog of version (None: the base one), blocking until the base is loaded.
+
+        Reads versions/<version>.json the first time; raises OSError or
+        ValueError if it is missing or malformed.
+        """
+        base = self.get()
+        if version is None:
+            return base
+        with self._lock:
+            cached = self._version_catalog
+            delta = self._deltas.get(version)
+        if cached is not None and cached.version == version and cached.base is base:
+            return cached
+        if delta is None:
+            delta = load_delta(version)
+        catalog = base.with_delta(delta)
+        with self._lock:
+            self._deltas[version] = delta
+            self._version_catalog = catalog
+        return catalog
+
+
+_service = CatalogService()
+
+
+def get_catalog_service():
+    """Return the shared service; every editor window uses the same instance."""
+    return _service
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Store the item and block lists of another Minecraft version "
+                                                 "as a delta against the bundled ones.")
+    parser.add_argument("version", help="version name, e.g. 1.20.4")
+    parser.add_argument("directory", help="directory holding that version's items.json and blocks.json")
+    args = parser.parse_args(argv)
+    delta = make_delta(args.directory)
+    os.makedirs(VERSIONS_DIR, exist_ok=True)
+    path = os.path.join(VERSIONS_DIR, f"{args.version}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(delta, f, ensure_ascii=False, indent=1)
+    changed = sum(len(names) for names in delta["removed"].values()) + sum(len(items) for items in delta["added"].values())
+    print(f"{path}: {changed} changed records")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
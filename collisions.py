@@ -0,0 +1,115 @@
+from typing import NamedTuple
+
+from catalog import normalize_name
+
+###############################################################
+# Ingredient collision detection.
+#
+# BreweryX picks the brew whose ingredients best match what is in
+# the cauldron, so two recipes with the same (or almost the same)
+# ingredients compete and players get the wrong one. Recipes are
+# indexed by a canonical ingredient signature for exact clashes
+# and by ingredient name for near ones, so checking a recipe only
+# looks at recipes sharing its rarest ingredients.
+###############################################################
+
+
+class Collision(NamedTuple):
+    # "exact": same ingredients and amounts; "amounts": same ingredients,
+    # other amounts; "near": one ingredient added, missing or swapped.
+    kind: str
+    location: str
+    other: str
+
+    def __str__(self):
+        if self.kind == "exact":
+            return f"{self.location}: same ingredients as {self.other}"
+        if self.kind == "amounts":
+            return f"{self.location}: same ingredients as {self.other}, other amounts"
+        return f"{self.location}: ingredients differ from {self.other} by one"
+
+
+def ingredient_signature(recipe):
+    """Canonical, hashable form of a recipe's ingredients: sorted (name, amount) pairs.
+
+    Names are normalized and repeated entries are added up, so the order
+    and spelling of the config do not matter.
+    """
+    amounts = {}
+    for ingredient in recipe.ingredients:
+        name = normalize_name(ingredient.name)
+        amounts[name] = amounts.get(name, 0) + (ingredient.amount or 1)
+    return tuple(sorted(amounts.items()))
+
+
+class RecipeIndex:
+    """Ingredient signatures of a set of recipes, for collision checks.
+
+    Recipes that share an ingredient set are only reported against the
+    first of them, so a config with many copies stays linear.
+    """
+
+    def __init__(self):
+        self.by_signature = {}    # signature -> first location
+        self.by_names = {}        # frozenset of names -> first location
+        self.by_ingredient = {}   # name -> [(location, names)], one per ingredient set
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def check(self, recipe, location=None):
+        """Return the Collisions recipe would have with the indexed recipes."""
+        location = location or recipe.key or recipe.name
+        return self._check(ingredient_signature(recipe), location)
+
+    def _check(self, signature, location):
+        if not signature:
+            return []
+        names = frozenset(name for name, _ in signature)
+        same = self.by_names.get(names)
+        if signature in self.by_signature:
+            collisions = [Collision("exact", location, self.by_signature[signature])]
+        elif same is not None:
+            collisions = [Collision("amounts", location, same)]
+        else:
+            collisions = []
+        size = len(names)
+        # A near match holds all but one of these ingredients, so it holds at
+        # least one of any two; the two rarest give the fewest candidates.
+        rarest = sorted(names, key=lambda name: len(self.by_ingredient.get(name, ())))[:2]
+        seen = {same}
+        for name in rarest:
+            for other, other_names in self.by_ingredient.get(name, ()):
+                if other in seen or abs(len(other_names) - size) > 1:
+                    continue
+                seen.add(other)
+                shared = len(names & other_names)
+                if shared >= 2 and max(size, len(other_names)) - shared <= 1:
+                    collisions.append(Collision("near", location, other))
+        return collisions
+
+    def add(self, recipe, location=None):
+        """Index recipe and return its Collisions with the recipes added before it."""
+        location = location or recipe.key or recipe.name
+        signature = ingredient_signature(recipe)
+        collisions = self._check(signature, location)
+        self.count += 1
+        if not signature:
+            return collisions
+        self.by_signature.setdefault(signature, location)
+        names = frozenset(name for name, _ in signature)
+        if names not in self.by_names:
+            self.by_names[names] = location
+            for name in names:
+                self.by_ingredient.setdefault(name, []).append((location, names))
+        return collisions
+
+
+def find_collisions(recipes):
+    """Return the Collisions among (location, recipe) pairs, each against an earlier recipe."""
+    index = RecipeIndex()
+    collisions = []
+    for location, recipe in recipes:
+        collisions += index.add(recipe, location)
+    return collisions
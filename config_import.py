@@ -0,0 +1,212 @@
+import re
+
+from recipe import recipe_from_dict
+
+###############################################################
+# Streaming importer for the recipes: section of a BreweryX
+# config.yml.
+#
+# The file is read line by line and only the lines of the recipe
+# currently being parsed are kept, so memory stays bounded no
+# matter how large the config is. Recipe bodies are parsed with a
+# small YAML subset (scalars, quoted strings, block and flow
+# sequences, one level of nested mappings, | and > blocks), which
+# is all BreweryX recipes use.
+###############################################################
+_KEY_LINE = re.compile(r"(?P<key>[^\s#'\"-][^:]*?|'[^']*'|\"[^\"]*\")\s*:(?:\s+(?P<value>.*))?$")
+_INT = re.compile(r"[-+]?\d+")
+_FLOAT = re.compile(r"[-+]?\d+\.\d+")
+
+
+class ConfigImportError(ValueError):
+    """Raised for recipe lines the importer cannot make sense of."""
+
+    def __init__(self, line_number, message):
+        super().__init__(f"line {line_number}: {message}")
+        self.line_number = line_number
+
+
+def _strip_comment(text):
+    """Drop a trailing ' # comment' that is not inside quotes."""
+    quote = None
+    for i, char in enumerate(text):
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in "'\"":
+            if i == 0 or text[i - 1] in " [,":
+                quote = char
+        elif char == "#" and (i == 0 or text[i - 1] in " \t"):
+            return text[:i].rstrip()
+    return text.rstrip()
+
+
+def parse_scalar(text):
+    text = _strip_comment(text.strip())
+    if len(text) >= 2 and text[0] == text[-1] == "'":
+        return text[1:-1].replace("''", "'")
+    if len(text) >= 2 and text[0] == text[-1] == '"':
+        return (text[1:-1].replace('\\"', '"').replace("\\n", "\n")
+                .replace("\\t", "\t").replace("\\\\", "\\"))
+    if text.startswith("[") and text.endswith("]"):
+        return [parse_scalar(part) for part in _split_flow(text[1:-1])]
+    lowered = text.lower()
+    if lowered in ("true", "yes", "on"):
+        return True
+    if lowered in ("false", "no", "off"):
+        return False
+    if lowered in ("", "~", "null"):
+        return None
+    if _INT.fullmatch(text):
+        return int(text)
+    if _FLOAT.fullmatch(text):
+        return float(text)
+    return text
+
+
+def _split_flow(text):
+    parts, current, quote = [], [], None
+    for char in text:
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in "'\"":
+            quote = char
+        elif char == ",":
+            parts.append("".join(current))
+            current = []
+            continue
+        current.append(char)
+    if "".join(current).strip():
+        parts.append("".join(current))
+    return parts
+
+
+def _indent(line):
+    return len(line) - len(line.lstrip(" "))
+
+
+def _unquote_key(key):
+    key = key.strip()
+    if len(key) >= 2 and key[0] == key[-1] and key[0] in "'\"":
+        return key[1:-1]
+    return key
+
+
+def parse_recipe_block(lines):
+    """Parse the (line_number, text) body lines of one recipe into a dict."""
+    data = {}
+    field_indent = None
+    field = None       # last key that had no inline value
+    block = None       # (field, style, indent) of an open | or > scalar
+    for line_number, line in lines:
+        indent = _indent(line)
+        body = line.strip()
+        if block:
+            name, style, block_indent = block
+            if indent > block_indent or not body:
+                data[name].append(line[block_indent + 2:] if body else "")
+                continue
+            joiner = "\n" if style == "|" else " "
+            data[name] = joiner.join(data[name]).strip("\n ")
+            block = None
+        if not body or body.startswith("#"):
+            continue
+        if field_indent is None:
+            field_indent = indent
+
+        if body.startswith("- ") or body == "-":
+            if field is None:
+                raise ConfigImportError(line_number, "list item without a key")
+            if data.get(field) is None:
+                data[field] = []
+            target = data[field]
+            if not isinstance(target, list):
+                raise ConfigImportError(line_number, f"'{field}' mixes a list with other values")
+            target.append(parse_scalar(body[1:]))
+            continue
+
+        match = _KEY_LINE.match(body)
+        if not match:
+            raise ConfigImportError(line_number, f"cannot parse '{body}'")
+        key = _unquote_key(match.group("key"))
+        value = match.group("value")
+        if indent > field_indent and field is not None:
+            # One level of nesting, e.g. a map of per-quality values.
+            if data.get(field) is None:
+                data[field] = {}
+            nested = data[field]
+            if not isinstance(nested, dict):
+                raise ConfigImportError(line_number, f"'{field}' mixes a map with other values")
+            nested[key] = parse_scalar(value) if value else None
+            continue
+        if value is None or _strip_comment(value) == "":
+            field = key
+            data[key] = None
+        elif _strip_comment(value) in ("|", ">", "|-", ">-"):
+            data[key] = []
+            block = (key, _strip_comment(value)[0], indent)
+            field = None
+        else:
+            field = None
+            data[key] = parse_scalar(value)
+    if block:
+        name, style, _ = block
+        data[name] = ("\n" if style == "|" else " ").join(data[name]).strip("\n ")
+    return data
+
+
+def iter_config_recipes(source, section="recipes"):
+    """Yield (key, Recipe, line_number) for each recipe of a config, one at a time.
+
+    source is a path or an iterable of lines (e.g. an open file). Only the
+    top-level section named section is read; the rest of the file is
+    skipped line by line without being parsed.
+    """
+    if isinstance(source, str):
+        with open(source, "r", encoding="utf-8") as f:
+            yield from iter_config_recipes(f, section)
+        return
+
+    in_section = False
+    recipe_indent = None
+    key = None
+    start = None
+    body = []
+    header = re.compile(rf"{re.escape(section)}\s*:\s*(#.*)?$")
+
+    def finish():
+        try:
+            return key, recipe_from_dict(parse_recipe_block(body), key=str(key)), start
+        except ConfigImportError:
+            raise
+        except Exception as e:
+            raise ConfigImportError(start, f"recipe '{key}': {e}") from e
+
+    for line_number, raw in enumerate(source, start=1):
+        line = raw.rstrip("\r\n").expandtabs(2)
+        stripped = line.strip()
+        if not in_section:
+            if _indent(line) == 0 and header.match(line):
+                in_section = True
+            continue
+        if not stripped or stripped.startswith("#"):
+            if key is not None:
+                body.append((line_number, line))
+            continue
+        indent = _indent(line)
+        if indent == 0:
+            break  # next top-level section
+        if recipe_indent is None:
+            recipe_indent = indent
+        if indent == recipe_indent:
+            if key is not None:
+                yield finish()
+            match = _KEY_LINE.match(stripped)
+            if not match:
+                raise ConfigImportError(line_number, f"expected a recipe key, got '{stripped}'")
+            key, start, body = _unquote_key(match.group("key")), line_number, []
+        else:
+            body.append((line_number, line))
+    if key is not None:
+        yield finish()
@@ -0,0 +1,123 @@
+import time
+from collections import deque
+from dataclasses import replace
+from typing import NamedTuple
+
+from recipe import ENTRY_FIELDS, common_ends
+
+###############################################################
+# Undo/redo history of a recipe being edited.
+#
+# Only the current Recipe is kept whole. Each undo or redo step
+# holds what turns one recipe into its neighbour: the previous
+# value of a changed field, or for the list fields (ingredients,
+# effects, lore, commands) a splice of just the entries that
+# changed, as in the autosave journal. A step then costs memory
+# for what the edit changed, not for the size of the recipe, and
+# undoing it hands back the splice that redoes it. Each editor
+# window keeps its own history.
+###############################################################
+
+# Steps kept per recipe; the oldest are dropped beyond this.
+MAX_DEPTH = 500
+# Typing edits to the same fields within this many seconds are one step.
+MERGE_SECONDS = 1.0
+
+
+class Splice(NamedTuple):
+    # Replace count entries of a list field, from start on, with entries.
+    start: int
+    count: int
+    entries: tuple
+
+
+def _change(before, after, field):
+    """What turns field's value after back into before."""
+    if field in ENTRY_FIELDS:
+        head, tail = common_ends(before, after)
+        return Splice(head, len(after) - head - tail, tuple(before[head:len(before) - tail]))
+    return before
+
+
+def _apply(recipe, step):
+    """Return (recipe with step applied, the step that takes it back)."""
+    changes, inverse = {}, {}
+    for field, change in step.items():
+        value = getattr(recipe, field)
+        if isinstance(change, Splice):
+            end = change.start + change.count
+            changes[field] = value[:change.start] + change.entries + value[end:]
+            inverse[field] = Splice(change.start, len(change.entries), value[change.start:end])
+        else:
+            changes[field] = change
+            inverse[field] = value
+    return replace(recipe, **changes), inverse
+
+
+class RecipeHistory:
+    """Current Recipe plus the steps back (undo) and forward (redo) from it."""
+
+    def __init__(self, recipe, max_depth=MAX_DEPTH, merge_seconds=MERGE_SECONDS, clock=time.monotonic):
+        self.current = recipe
+        self.undo_stack = deque(maxlen=max_depth)
+        self.redo_stack = []
+        self.merge_seconds = merge_seconds
+        self.clock = clock
+        self._last_fields = None
+        self._last_time = 0.0
+
+    def __len__(self):
+        return len(self.undo_stack)
+
+    @property
+    def can_undo(self):
+        return bool(self.undo_stack)
+
+    @property
+    def can_redo(self):
+        return bool(self.redo_stack)
+
+    def edit(self, merge=False, **changes):
+        """Apply changes (Recipe fields) and return the new current recipe.
+
+        Changes that leave every field as it is are ignored, so widgets that
+        echo a restored value back do not clear the redo stack. With merge,
+        an edit of the same fields as the previous one shortly after it
+        (e.g. typing) updates that step instead of adding one.
+        """
+        current = self.current
+        if all(getattr(current, field) is value or getattr(current, field) == value
+               for field, value in changes.items()):
+            return current
+        now = self.clock()
+        fields = frozenset(changes)
+        before = current
+        if (merge and fields == self._last_fields and now - self._last_time < self.merge_seconds
+                and self.undo_stack):
+            # The merged step goes back to where the previous one did.
+            before, _ = _apply(current, self.undo_stack.pop())
+        self.current = replace(current, **changes)
+        self.undo_stack.append({field: _change(getattr(before, field), getattr(self.current, field), field)
+                                for field in fields})
+        self.redo_stack.clear()
+        self._last_fields = fields if merge else None
+        self._last_time = now
+        return self.current
+
+    def undo(self):
+        """Step back; returns the restored recipe, or None if there is nothing to undo."""
+        if not self.undo_stack:
+            return None
+        self.current, step = _apply(self.current, self.undo_stack.pop())
+        self.redo_stack.append(step)
+        self._last_fields = None
+        return self.current
+
+    def redo(self):
+        """Step forward again; returns the restored recipe, or None."""
+        if not self.redo_stack:
+            return None
+        self.current, step = _apply(self.current, self.redo_stack.pop())
+        self.undo_stack.append(step)
+        self._last_fields = None
+        return self.current
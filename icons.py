@@ -0,0 +1,254 @@
+import os
+import queue
+import threading
+import tkinter as tk
+from collections import OrderedDict
+from weakref import WeakKeyDictionary
+
+###############################################################
+# Effect icon cache.
+#
+# Every effect icon is decoded once per Tk root. After the first
+# run all icons live in one sprite atlas (effects/atlas.png plus
+# effects/atlas.txt), so later runs read a single file and cut
+# the icons out of it in memory.
+###############################################################
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+EFFECTS_DIR = os.path.join(BASE_DIR, "effects")
+ATLAS_IMAGE = "atlas.png"
+ATLAS_INDEX = "atlas.txt"
+
+
+class EffectIcons:
+    """PhotoImages for every icon in an effects directory, keyed by effect name."""
+
+    def __init__(self, root, directory=EFFECTS_DIR):
+        self.root = root
+        self.directory = directory
+        self.icons = {}
+        names = self._source_names()
+        if not self._load_atlas(names):
+            self._build_atlas(names)
+
+    def get(self, effect):
+        return self.icons.get(effect.lower())
+
+    def _source_names(self):
+        try:
+            files = os.listdir(self.directory)
+        except OSError:
+            return []
+        return sorted(f[:-4] for f in files if f.endswith(".png") and f != ATLAS_IMAGE)
+
+    def _path(self, file_name):
+        return os.path.join(self.directory, file_name)
+
+    def _load_atlas(self, names):
+        """Cut the icons out of a saved atlas; False if it is missing or stale."""
+        try:
+            with open(self._path(ATLAS_INDEX), "r", encoding="utf-8") as f:
+                entries = [line.split() for line in f if line.strip()]
+            atlas_mtime = os.stat(self._path(ATLAS_IMAGE)).st_mtime_ns
+            if [entry[0] for entry in entries] != names:
+                return False
+            if any(os.stat(self._path(f"{name}.png")).st_mtime_ns > atlas_mtime for name in names):
+                return False
+            atlas = tk.PhotoImage(master=self.root, file=self._path(ATLAS_IMAGE))
+        except (OSError, ValueError, tk.TclError):
+            return False
+        for name, x, width, height in entries:
+            x, width, height = int(x), int(width), int(height)
+            icon = tk.PhotoImage(master=self.root, width=width, height=height)
+            icon.tk.call(icon, "copy", atlas, "-from", x, 0, x + width, height)
+            self.icons[name] = icon
+        return True
+
+    def _build_atlas(self, names):
+        """Decode each icon file once and save them side by side for next time."""
+        for name in names:
+            try:
+                self.icons[name] = tk.PhotoImage(master=self.root, file=self._path(f"{name}.png"))
+            except tk.TclError as e:
+                print(f"Error loading image for {name}: {e}")
+        if not self.icons:
+            return
+        width = sum(icon.width() for icon in self.icons.values())
+        height = max(icon.height() for icon in self.icons.values())
+        atlas = tk.PhotoImage(master=self.root, width=width, height=height)
+        entries = []
+        x = 0
+        for name, icon in self.icons.items():
+            atlas.tk.call(atlas, "copy", icon, "-to", x, 0)
+            entries.append(f"{name} {x} {icon.width()} {icon.height()}\n")
+            x += icon.width()
+        if len(self.icons) != len(names):
+            # Don't persist an atlas that would be missing the broken icons.
+            return
+        try:
+            atlas.write(self._path(ATLAS_IMAGE), format="png")
+            with open(self._path(ATLAS_INDEX), "w", encoding="utf-8") as f:
+                f.writelines(entries)
+        except (OSError, tk.TclError):
+            pass
+
+
+_effect_icons = WeakKeyDictionary()
+
+
+def effect_icons(widget):
+    """Return the EffectIcons shared by every widget of widget's Tk root."""
+    root = widget.nametowidget(".")
+    icons = _effect_icons.get(root)
+    if icons is None:
+        icons = _effect_icons[root] = EffectIcons(root)
+    return icons
+
+
+###############################################################
+# Item icons.
+#
+# Item icons are decoded lazily on a worker thread, only for the
+# rows the selector actually shows, and the finished PhotoImages
+# are kept in a size-bounded LRU.
+###############################################################
+ITEM_IMAGES_DIR = os.path.join(BASE_DIR, "item_images")
+
+
+class ItemIconLoader:
+    """Decodes item_images/<name>.png off the Tk thread into a bounded LRU.
+
+    request(names) is called with the names of the rows on screen and
+    get(name) returns an icon once it is cached. The worker only opens and
+    resizes the file with PIL; the PhotoImage is created back on the Tk
+    thread, which drains the result queue from an after() poll and then
+    calls on_ready(names). When the cache is full the least recently used
+    icon is dropped and on_evict(name) is called so widgets can stop
+    referring to it. The worker stops when widget is destroyed.
+    """
+
+    def __init__(self, widget, on_ready, on_evict=None, directory=ITEM_IMAGES_DIR,
+                 size=16, max_icons=256, poll_ms=30):
+        self.widget = widget
+        self.on_ready = on_ready
+        self.on_evict = on_evict
+        self.directory = directory
+        self.size = size
+        self.max_icons = max_icons
+        self.poll_ms = poll_ms
+        self.cache = OrderedDict()
+        self.missing = set()
+        self.pending = set()
+        # Names the widget still wants; the worker skips anything scrolled away.
+        self.wanted = set()
+        self.requests = queue.Queue()
+        self.results = queue.Queue()
+        self.enabled = os.path.isdir(directory)
+        self.thread = None
+        self.polling = None
+        widget.bind("<Destroy>", self._on_destroy, add="+")
+
+    def _on_destroy(self, event):
+        if event.widget is self.widget:
+            self.close()
+
+    def close(self):
+        """Stop the worker thread and drop the cached icons."""
+        self.enabled = False
+        if self.thread is not None:
+            self.requests.put(None)
+            self.thread = None
+        self.cache.clear()
+
+    def get(self, name):
+        icon = self.cache.get(name)
+        if icon is not None:
+            self.cache.move_to_end(name)
+        return icon
+
+    def request(self, names):
+        """Queue the given names for decoding; earlier requests not in names are dropped."""
+        if not self.enabled:
+            return
+        self.wanted = set(names)
+        for name in names:
+            if name in self.cache or name in self.missing or name in self.pending:
+                continue
+            self.pending.add(name)
+            self.requests.put(name)
+        if self.pending:
+            self._start()
+
+    def _start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._work, name="item-icons", daemon=True)
+            self.thread.start()
+        if self.polling is None:
+            self.polling = self.widget.after(self.poll_ms, self._poll)
+
+    def _work(self):
+        try:
+            from PIL import Image
+        except ImportError:
+            self.enabled = False
+            return
+        while True:
+            name = self.requests.get()
+            if name is None:
+                return  # close()
+            if name not in self.wanted:
+                self.results.put((name, False))
+                continue
+            path = os.path.join(self.directory, f"{name}.png")
+            image = None
+            if os.path.exists(path):
+                try:
+                    with Image.open(path) as img:
+                        image = img.convert("RGBA").resize((self.size, self.size), Image.LANCZOS)
+                except Exception as e:
+                    print(f"Error loading image for {name}: {e}")
+            self.results.put((name, image))
+
+    def _poll(self):
+        self.polling = None
+        if not self.enabled or not self.widget.winfo_exists():
+            return
+        from PIL import ImageTk
+
+        ready = []
+        while True:
+            try:
+                name, image = self.results.get_nowait()
+            except queue.Empty:
+                break
+            self.pending.discard(name)
+            if image is False:
+                continue  # skipped, may be requested again later
+            if image is None:
+                self.missing.add(name)
+                continue
+            self.cache[name] = ImageTk.PhotoImage(image, master=self.widget)
+            ready.append(name)
+            while len(self.cache) > self.max_icons:
+                evicted, _ = self.cache.popitem(last=False)
+                if self.on_evict:
+                    self.on_evict(evicted)
+        if ready:
+            self.on_ready(ready)
+        if self.pending and self.enabled:
+            self.polling = self.widget.after(self.poll_ms, self._poll)
+
+
+###############################################################
+# Other images.
+###############################################################
+def decode_image(path):
+    """Read an image file completely with PIL; safe to call off the Tk thread.
+
+    PIL is imported here rather than at startup, so only the code paths
+    that show such images pay for it.
+    """
+    from PIL import Image
+
+    image = Image.open(path)
+    image.load()
+    return image
@@ -0,0 +1,222 @@
+import os
+import json
+import glob
+import time
+from dataclasses import fields, replace
+
+from catalog import BASE_DIR
+from recipe import ENTRY_FIELDS, SECTION_FIELDS, Effect, Ingredient, Recipe, common_ends
+
+###############################################################
+# Crash-safe autosave of the recipes being edited.
+#
+# Every editor session appends one JSON line per edit to its own
+# journal file: "open" with the whole recipe, then "edit" with only
+# the fields that changed (and, for lists, only the entries between
+# the unchanged head and tail), then "close" once the recipe is
+# finalized or dropped. Nothing is ever rewritten in place: after
+# COMPACT_EVERY records the open recipes are written to a new file
+# that replaces the journal with os.replace(), so a crash leaves
+# either the old journal or the new one. On startup the journals
+# of sessions that did not end cleanly are replayed.
+###############################################################
+
+AUTOSAVE_DIR = os.path.join(BASE_DIR, "autosave")
+JOURNAL_PATTERN = "session-*.jsonl"
+# Records appended before the journal is compacted into a snapshot.
+COMPACT_EVERY = 1000
+
+RECIPE_FIELDS = tuple(field.name for field in fields(Recipe))
+
+
+def _encode(field, value):
+    # Ingredients and effects become lists; names may contain "/".
+    if field in ("ingredients", "effects"):
+        return [list(entry) for entry in value]
+    if isinstance(value, tuple):
+        return list(value)
+    return value
+
+
+def _decode(field, value):
+    if field == "ingredients":
+        return tuple(Ingredient(*entry) for entry in value)
+    if field == "effects":
+        return tuple(Effect(*entry) for entry in value)
+    if isinstance(value, list):
+        return tuple(value)
+    return value
+
+
+def encode_recipe(recipe):
+    return {field: _encode(field, getattr(recipe, field)) for field in RECIPE_FIELDS}
+
+
+def decode_recipe(data):
+    return Recipe(**{field: _decode(field, value) for field, value in data.items() if field in RECIPE_FIELDS})
+
+
+def diff_recipe(old, new):
+    """The record fields turning old into new: {"set": {...}, "splice": [...]}."""
+    changes = {}
+    splices = []
+    for field in SECTION_FIELDS + ("key",):
+        before, after = getattr(old, field), getattr(new, field)
+        if before is after or before == after:
+            continue
+        if field in ENTRY_FIELDS and before and after:
+            head, tail = common_ends(before, after)
+            splices.append([field, head, len(before) - tail, _encode(field, after[head:len(after) - tail])])
+        else:
+            changes[field] = _encode(field, after)
+    record = {}
+    if changes:
+        record["set"] = changes
+    if splices:
+        record["splice"] = splices
+    return record
+
+
+def apply_record(recipe, record):
+    """The recipe after an "edit" record."""
+    changes = {field: _decode(field, value) for field, value in record.get("set", {}).items()}
+    for field, start, end, entries in record.get("splice", ()):
+        value = getattr(recipe, field)
+        changes[field] = value[:start] + _decode(field, entries) + value[end:]
+    return replace(recipe, **changes)
+
+
+def replay(path):
+    """Return {id: Recipe} of the recipes a journal leaves open.
+
+    Replay stops at the first line that does not parse, which can only be
+    a record cut short by a crash.
+    """
+    recipes = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+                op, recipe_id = record["op"], record["id"]
+                if op == "open":
+                    recipes[recipe_id] = decode_recipe(record["recipe"])
+                elif op == "edit":
+                    recipes[recipe_id] = apply_record(recipes[recipe_id], record)
+                elif op == "close":
+                    recipes.pop(recipe_id, None)
+            except (ValueError, KeyError, TypeError, IndexError):
+                break
+    return recipes
+
+
+def _session_alive(path):
+    # Journals are named session-<pid>-<time>.jsonl. Another running editor
+    # still owns its journal; process checks are only reliable on POSIX.
+    if os.name != "posix":
+        return False
+    try:
+        pid = int(os.path.basename(path).split("-")[1])
+        os.kill(pid, 0)
+    except (ValueError, IndexError, ProcessLookupError):
+        return False
+    except PermissionError:
+        return True
+    return pid != os.getpid()
+
+
+def find_orphans(directory=AUTOSAVE_DIR, exclude=None):
+    """Journals left by sessions that are no longer running."""
+    return [path for path in sorted(glob.glob(os.path.join(directory, JOURNAL_PATTERN)))
+            if path != exclude and not _session_alive(path)]
+
+
+def recover(directory=AUTOSAVE_DIR, exclude=None):
+    """Return (recipes, paths): the open recipes of every orphaned journal, and those journals."""
+    recipes = []
+    paths = find_orphans(directory, exclude)
+    for path in paths:
+        try:
+            recipes += replay(path).values()
+        except (OSError, UnicodeDecodeError):
+            pass
+    return recipes, paths
+
+
+def discard(paths):
+    """Delete journals, with any snapshot a crash left half-written."""
+    for path in paths:
+        for leftover in (path, path + ".tmp"):
+            try:
+                os.remove(leftover)
+            except OSError:
+                pass
+
+
+class AutosaveJournal:
+    """Append-only journal of the recipes open in one editor session."""
+
+    def __init__(self, path, compact_every=COMPACT_EVERY):
+        self.path = path
+        self.compact_every = compact_every
+        self.recipes = {}       # id -> last journaled Recipe
+        self.next_id = 1
+        self.appended = 0
+        self.file = open(path, "a", encoding="utf-8")
+
+    @classmethod
+    def start(cls, directory=AUTOSAVE_DIR, **kwargs):
+        os.makedirs(directory, exist_ok=True)
+        name = f"session-{os.getpid()}-{int(time.time() * 1000)}.jsonl"
+        return cls(os.path.join(directory, name), **kwargs)
+
+    def open(self, recipe):
+        """Start journaling recipe; returns its id for update() and close()."""
+        recipe_id = self.next_id
+        self.next_id += 1
+        self.recipes[recipe_id] = recipe
+        self._append({"op": "open", "id": recipe_id, "recipe": encode_recipe(recipe)})
+        return recipe_id
+
+    def update(self, recipe_id, recipe):
+        """Record the fields in which recipe differs from its last journaled state."""
+        old = self.recipes.get(recipe_id)
+        if old is None or old is recipe:
+            return
+        record = diff_recipe(old, recipe)
+        self.recipes[recipe_id] = recipe
+        if record:
+            record.update(op="edit", id=recipe_id)
+            self._append(record)
+
+    def close(self, recipe_id):
+        if self.recipes.pop(recipe_id, None) is not None:
+            self._append({"op": "close", "id": recipe_id})
+
+    def _append(self, record):
+        # One short line per edit; flushed so that a crash of the
+        # application loses nothing, fsynced only when compacting.
+        self.file.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+        self.file.flush()
+        self.appended += 1
+        if self.appended >= self.compact_every:
+            self.compact()
+
+    def compact(self):
+        """Replace the journal with one "open" record per open recipe."""
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            for recipe_id, recipe in self.recipes.items():
+                record = {"op": "open", "id": recipe_id, "recipe": encode_recipe(recipe)}
+                f.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.file.close()
+        os.replace(temp_path, self.path)
+        self.file = open(self.path, "a", encoding="utf-8")
+        self.appended = 0
+
+    def shutdown(self):
+        """Close the journal; it is only kept if recipes are still open."""
+        self.file.close()
+        if not self.recipes:
+            discard([self.path])
@@ -0,0 +1,195 @@
+import os
+import json
+import sqlite3
+from typing import NamedTuple
+
+from catalog import BASE_DIR, normalize_name
+from journal import decode_recipe, encode_recipe
+from recipe import recipe_key
+
+###############################################################
+# Local recipe library.
+#
+# Finished and imported recipes are kept in one SQLite file,
+# grouped by server. A recipe row holds the whole recipe as JSON
+# (the autosave journal's encoding) next to the columns that are
+# searched: wood and difficulty are indexed on the row, and each
+# ingredient and effect name gets a row in a WITHOUT ROWID table
+# keyed by (name, recipe), so "everything with NIGHT_VISION" is
+# one index range however many recipes there are. Saving many
+# recipes at once (a whole config) is a single transaction.
+###############################################################
+
+LIBRARY_PATH = os.path.join(BASE_DIR, "library.sqlite3")
+# Keys looked up per statement by existing_keys().
+KEY_BATCH = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS recipes (
+    id INTEGER PRIMARY KEY,
+    server TEXT NOT NULL,
+    key TEXT NOT NULL,
+    name TEXT NOT NULL,
+    wood TEXT,
+    difficulty INTEGER,
+    data TEXT NOT NULL,
+    UNIQUE (server, key)
+);
+CREATE INDEX IF NOT EXISTS recipes_wood ON recipes (wood);
+CREATE INDEX IF NOT EXISTS recipes_difficulty ON recipes (difficulty);
+CREATE TABLE IF NOT EXISTS recipe_ingredients (
+    name TEXT NOT NULL,
+    recipe_id INTEGER NOT NULL,
+    PRIMARY KEY (name, recipe_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS recipe_ingredients_recipe ON recipe_ingredients (recipe_id);
+CREATE TABLE IF NOT EXISTS recipe_effects (
+    name TEXT NOT NULL,
+    recipe_id INTEGER NOT NULL,
+    PRIMARY KEY (name, recipe_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS recipe_effects_recipe ON recipe_effects (recipe_id);
+"""
+
+
+class LibraryEntry(NamedTuple):
+    # data is the stored JSON; a list of search results only needs the
+    # name, so the Recipe is decoded when it is asked for.
+    server: str
+    key: str
+    name: str
+    data: str
+
+    @property
+    def recipe(self):
+        return decode_recipe(json.loads(self.data))
+
+
+def _wood(value):
+    # Wood is a number or a wood name depending on the config.
+    return None if value in (None, "") else str(value).strip().lower()
+
+
+def _difficulty(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class RecipeLibrary:
+    """Recipes of several servers in an SQLite file, searchable by ingredient, effect, wood and difficulty."""
+
+    def __init__(self, path=LIBRARY_PATH):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM recipes").fetchone()[0]
+
+    def servers(self):
+        return [row[0] for row in self.connection.execute("SELECT DISTINCT server FROM recipes ORDER BY server")]
+
+    def save(self, server, recipe, key=None, replace=True):
+        """Add recipe to server's recipes; see save_all() for replace."""
+        self.save_all(server, [(key, recipe)], replace)
+
+    def existing_keys(self, server, pairs):
+        """The keys of (key, Recipe) pairs that server already has a recipe under."""
+        keys = list(dict.fromkeys(key or recipe_key(recipe) for key, recipe in pairs))
+        found = set()
+        # SQLite limits the number of parameters of one statement.
+        for start in range(0, len(keys), KEY_BATCH):
+            chunk = keys[start:start + KEY_BATCH]
+            found.update(row[0] for row in self.connection.execute(
+                f"SELECT key FROM recipes WHERE server = ? AND key IN ({', '.join('?' * len(chunk))})",
+                [server] + chunk))
+        return found
+
+    def save_all(self, server, pairs, replace=True):
+        """Add (key, Recipe) pairs in one transaction; a None key comes from the recipe.
+
+        A recipe whose key server already has replaces that recipe, or with
+        replace=False is saved under the key with a numeric suffix (like
+        write_recipes() does). Recipes of the same batch never replace each
+        other, and a suffixed key never replaces anything. Returns the number
+        of recipes saved.
+        """
+        count = 0
+        used = set()
+        with self.connection:
+            cursor = self.connection.cursor()
+            for key, recipe in pairs:
+                key = base = key or recipe_key(recipe)
+                suffix = 2
+                while True:
+                    row = cursor.execute("SELECT id FROM recipes WHERE server = ? AND key = ?",
+                                         (server, key)).fetchone()
+                    if key not in used and (row is None or (replace and key == base)):
+                        break
+                    key = f"{base}_{suffix}"
+                    suffix += 1
+                used.add(key)
+                values = (recipe.name, _wood(recipe.wood), _difficulty(recipe.difficulty),
+                          json.dumps(encode_recipe(recipe), ensure_ascii=False, separators=(",", ":")))
+                if row is None:
+                    cursor.execute("INSERT INTO recipes (name, wood, difficulty, data, server, key) "
+                                   "VALUES (?, ?, ?, ?, ?, ?)", values + (server, key))
+                    recipe_id = cursor.lastrowid
+                else:
+                    recipe_id = row[0]
+                    cursor.execute("UPDATE recipes SET name = ?, wood = ?, difficulty = ?, data = ? WHERE id = ?",
+                                   values + (recipe_id,))
+                    cursor.execute("DELETE FROM recipe_ingredients WHERE recipe_id = ?", (recipe_id,))
+                    cursor.execute("DELETE FROM recipe_effects WHERE recipe_id = ?", (recipe_id,))
+                cursor.executemany("INSERT OR IGNORE INTO recipe_ingredients (name, recipe_id) VALUES (?, ?)",
+                                   [(normalize_name(ingredient.name), recipe_id) for ingredient in recipe.ingredients])
+                cursor.executemany("INSERT OR IGNORE INTO recipe_effects (name, recipe_id) VALUES (?, ?)",
+                                   [(effect.name.strip().upper(), recipe_id) for effect in recipe.effects])
+                count += 1
+        return count
+
+    def delete(self, server, key):
+        with self.connection:
+            row = self.connection.execute("SELECT id FROM recipes WHERE server = ? AND key = ?", (server, key)).fetchone()
+            if row is None:
+                return False
+            for table in ("recipe_ingredients", "recipe_effects"):
+                self.connection.execute(f"DELETE FROM {table} WHERE recipe_id = ?", row)
+            self.connection.execute("DELETE FROM recipes WHERE id = ?", row)
+        return True
+
+    def find(self, ingredient=None, effect=None, wood=None, difficulty=None, server=None, limit=None):
+        """LibraryEntries matching every filter given, ordered by server and key.
+
+        ingredient is a name as written in a config ("minecraft:sweet_berries"
+        or "sweet_berries"), effect a potion effect name.
+        """
+        conditions, parameters = [], []
+        if ingredient:
+            conditions.append("id IN (SELECT recipe_id FROM recipe_ingredients WHERE name = ?)")
+            parameters.append(normalize_name(ingredient))
+        if effect:
+            conditions.append("id IN (SELECT recipe_id FROM recipe_effects WHERE name = ?)")
+            parameters.append(effect.strip().upper())
+        if wood not in (None, ""):
+            conditions.append("wood = ?")
+            parameters.append(_wood(wood))
+        if difficulty not in (None, ""):
+            conditions.append("difficulty = ?")
+            parameters.append(_difficulty(difficulty))
+        if server:
+            conditions.append("server = ?")
+            parameters.append(server)
+        query = "SELECT server, key, name, data FROM recipes"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY server, key"
+        if limit is not None:
+            query += " LIMIT ?"
+            parameters.append(limit)
+        return [LibraryEntry(*row) for row in self.connection.execute(query, parameters)]
@@ -0,0 +1,180 @@
+import os
+import json
+
+from recipe import POTION_EFFECTS
+from search import FIELD_SEPARATOR
+
+###############################################################
+# Locale catalogs.
+#
+# Every editor string is written in English and looked up in the
+# active locale's catalog (locales/<code>.json) through _(). A
+# catalog also names the potion effects and, optionally, the
+# items and blocks:
+#
+#   {"messages": {"Cancel": "取消", ...},
+#    "effects": {"SPEED": "速度", ...},
+#    "items": {"wheat": "小麦", ...},
+#    "minecraft_lang": "zh_cn.json",
+#    "search_initials": "pinyin",
+#    "styles": {"TButton": {"padding": 6}}}
+#
+# minecraft_lang names a language file from the game client
+# (assets/minecraft/lang/) dropped into locales/; its item and
+# block names fill in every record "items" does not cover. The
+# search keys of effects and items are computed once, when the
+# locale or the catalog is loaded, so a keystroke costs the same
+# in every language. "styles" holds ttk.Style options the
+# language's layout needs, applied once the window is up.
+###############################################################
+
+LOCALES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "locales")
+DEFAULT_LOCALE = "en"
+LOCALE_ENV = "BREWERY_LOCALE"
+# Key prefixes of item and block names in a game language file.
+MINECRAFT_LANG_PREFIXES = ("item.minecraft.", "block.minecraft.")
+
+# GB2312 orders its level 1 hanzi by pinyin, so the code at which each
+# initial starts is enough to find the initial of any of them.
+GB2312_INITIALS = (
+    (45217, "a"), (45253, "b"), (45761, "c"), (46318, "d"), (46826, "e"),
+    (47010, "f"), (47297, "g"), (47614, "h"), (48119, "j"), (49062, "k"),
+    (49324, "l"), (49896, "m"), (50371, "n"), (50614, "o"), (50622, "p"),
+    (50906, "q"), (51387, "r"), (51446, "s"), (52218, "t"), (52698, "w"),
+    (52980, "x"), (53689, "y"), (54481, "z"),
+)
+GB2312_LEVEL1_END = 55289
+
+
+def _gb2312_initial(char):
+    try:
+        encoded = char.encode("gb2312")
+    except UnicodeEncodeError:
+        return ""
+    if len(encoded) != 2:
+        return ""
+    code = encoded[0] * 256 + encoded[1]
+    if not GB2312_INITIALS[0][0] <= code < GB2312_LEVEL1_END:
+        return ""
+    initial = ""
+    for start, letter in GB2312_INITIALS:
+        if code < start:
+            break
+        initial = letter
+    return initial
+
+
+def pinyin_initials(text):
+    """Lowercase pinyin initials of the hanzi in text ("磨制花岗岩" -> "mzhgy").
+
+    Uses pypinyin when it is installed; otherwise only the 3755 common
+    (GB2312 level 1) hanzi get an initial. Letters and digits are kept.
+    """
+    try:
+        from pypinyin import Style, lazy_pinyin
+    except ImportError:
+        return "".join(char.lower() if char.isascii() else _gb2312_initial(char)
+                       for char in text if char.isalnum())
+    return "".join(lazy_pinyin([char for char in text if char.isalnum()], style=Style.FIRST_LETTER)).lower()
+
+
+def read_minecraft_lang(path):
+    """Item and block names from a game language file, keyed by catalog name."""
+    with open(path, "r", encoding="utf-8") as f:
+        entries = json.load(f)
+    names = {}
+    for key, value in entries.items():
+        for prefix in MINECRAFT_LANG_PREFIXES:
+            # Keys with more dots are tooltips and variants, not names.
+            if key.startswith(prefix) and "." not in key[len(prefix):]:
+                names.setdefault(key[len(prefix):], value)
+    return names
+
+
+class Locale:
+    """Translated UI strings, effect and item names of one language."""
+
+    def __init__(self, code=DEFAULT_LOCALE, messages=None, effects=None, items=None, initials=None, styles=None,
+                 stamp=None):
+        self.code = code
+        # (mtime_ns, size) of the files read, so caches of translated data
+        # can tell an edited locale from the one they were built with.
+        self.stamp = stamp
+        self.messages = dict(messages or {})
+        self.effects = dict(effects or {})
+        self.items = dict(items or {})
+        # ttk style name -> Style.configure() options.
+        self.styles = dict(styles or {})
+        self.initials = pinyin_initials if initials == "pinyin" else None
+        # Effects never change, so their keys are built once per locale.
+        self.effect_keys = {effect: self.search_key(effect, self.effect_name(effect))
+                            for effect in POTION_EFFECTS}
+
+    @classmethod
+    def load(cls, code, directory=LOCALES_DIR):
+        """Read locales/<code>.json; English needs no file."""
+        path = os.path.join(directory, f"{code}.json")
+        if code == DEFAULT_LOCALE and not os.path.exists(path):
+            return cls()
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        items = {}
+        paths = [path]
+        lang_file = data.get("minecraft_lang")
+        if lang_file and os.path.exists(os.path.join(directory, lang_file)):
+            paths.append(os.path.join(directory, lang_file))
+            items = read_minecraft_lang(paths[-1])
+        items.update(data.get("items", {}))
+        stamp = tuple((st.st_mtime_ns, st.st_size) for st in map(os.stat, paths))
+        return cls(code, data.get("messages"), data.get("effects"), items, data.get("search_initials"),
+                   data.get("styles"), stamp)
+
+    def gettext(self, message):
+        return self.messages.get(message, message)
+
+    def effect_name(self, effect):
+        return self.effects.get(effect, effect)
+
+    def item_name(self, name):
+        """Translated name of a catalog or ingredient name, or None."""
+        return self.items.get(name.lower().removeprefix("minecraft:"))
+
+    def item_label(self, item):
+        """Text of an item row: the translated name followed by the catalog name."""
+        name = item.get("name", "Unknown")
+        translated = self.item_name(name)
+        return f"{translated} ({name})" if translated else name
+
+    def search_key(self, *texts):
+        """Lowercased texts (and their initials) joined into one search key."""
+        fields = []
+        for text in texts:
+            fields.append(text.lower())
+            if self.initials is not None and not text.isascii():
+                fields.append(self.initials(text))
+        return FIELD_SEPARATOR.join(dict.fromkeys(field for field in fields if field))
+
+    def item_search_key(self, item):
+        """Search key of a catalog record: name, displayName and translated name."""
+        name = item.get("name", "")
+        translated = self.item_name(name)
+        return self.search_key(name, item.get("displayName", name), *([translated] if translated else ()))
+
+
+_locale = Locale()
+
+
+def set_locale(code):
+    """Make the catalog for code the active one; call before building any window."""
+    global _locale
+    _locale = Locale.load(code)
+    return _locale
+
+
+def get_locale():
+    return _locale
+
+
+def _(message):
+    """The active locale's translation of an English UI string."""
+    return _locale.gettext(message)
@@ -0,0 +1,158 @@
+import os
+import sys
+import time
+import atexit
+import functools
+import tkinter as tk
+
+###############################################################
+# Opt-in Tk instrumentation.
+#
+#   BREWERY_PROFILE=1 python BreweryXRecipeEditor.py
+#
+# Every Python callback Tk runs (button commands, bindings,
+# variable traces, after() jobs) is timed, and a heartbeat after()
+# probe records every time the main loop was blocked for longer
+# than the stall threshold. A summary of the slowest callbacks and
+# the stalls is printed on exit, or at any time with Ctrl+F12.
+###############################################################
+
+PROFILE_ENV = "BREWERY_PROFILE"
+STALL_THRESHOLD_MS = 100
+HEARTBEAT_MS = 50
+DUMP_KEY = "<Control-F12>"
+
+
+def callback_name(func):
+    """Readable name for a Tk callback, with the line number for lambdas and closures."""
+    func = getattr(func, "__func__", func)
+    name = getattr(func, "__qualname__", None) or type(func).__name__
+    code = getattr(func, "__code__", None)
+    if code is not None and "<" in name:
+        name = f"{name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+    return name
+
+
+class TkProfiler:
+    """Times Tk callbacks and detects main loop stalls; see install() and watch().
+
+    Times are inclusive: a callback that sets a traced variable also counts
+    the time of the trace handler it triggers.
+    """
+
+    def __init__(self, threshold_ms=STALL_THRESHOLD_MS, heartbeat_ms=HEARTBEAT_MS, out=None):
+        self.threshold = threshold_ms / 1000
+        self.heartbeat_ms = heartbeat_ms
+        self.out = out
+        self.stats = {}      # name -> [calls, total seconds, worst seconds]
+        self.stalls = []     # (seconds since start, stall seconds, slowest callback meanwhile)
+        self.started = time.perf_counter()
+        self.slowest = None  # (seconds, name) of the slowest callback since the last beat
+        self.expected = None
+        self.root = None
+        self._originals = None
+
+    def install(self):
+        """Wrap every callback registered with Tk from now on; call before building widgets."""
+        if self._originals is not None:
+            return
+        register, after, trace_register = tk.Misc._register, tk.Misc.after, tk.Variable._register
+        self._originals = (register, after, trace_register)
+        profiler = self
+
+        def _register(widget, func, subst=None, needcleanup=1):
+            # after() registers its own wrapper, which is timed under the
+            # name of the scheduled function instead.
+            if not getattr(func, "__qualname__", "").endswith("after.<locals>.callit"):
+                func = profiler.timed(func)
+            return register(widget, func, subst, needcleanup)
+
+        def _after(widget, ms, func=None, *args):
+            if func is not None and func != profiler._beat:
+                func = profiler.timed(func)
+            return after(widget, ms, func, *args)
+
+        def _trace_register(variable, callback):
+            # Variables register their trace callbacks themselves.
+            return trace_register(variable, profiler.timed(callback))
+
+        tk.Misc._register = _register
+        tk.Misc.after = _after
+        tk.Variable._register = _trace_register
+
+    def uninstall(self):
+        if self._originals is not None:
+            tk.Misc._register, tk.Misc.after, tk.Variable._register = self._originals
+            self._originals = None
+
+    def watch(self, root):
+        """Start the heartbeat on root, dump the summary at exit and on DUMP_KEY."""
+        self.root = root
+        root.bind_all(DUMP_KEY, lambda event: self.dump(), add="+")
+        atexit.register(self.dump)
+        self.expected = time.perf_counter() + self.heartbeat_ms / 1000
+        root.after(self.heartbeat_ms, self._beat)
+
+    def timed(self, func):
+        name = callback_name(func)
+
+        @functools.wraps(func)
+        def timed_callback(*args):
+            start = time.perf_counter()
+            try:
+                return func(*args)
+            finally:
+                self.record(name, time.perf_counter() - start)
+
+        return timed_callback
+
+    def record(self, name, seconds):
+        stat = self.stats.get(name)
+        if stat is None:
+            stat = self.stats[name] = [0, 0.0, 0.0]
+        stat[0] += 1
+        stat[1] += seconds
+        if seconds > stat[2]:
+            stat[2] = seconds
+        if self.slowest is None or seconds > self.slowest[0]:
+            self.slowest = (seconds, name)
+
+    def _beat(self):
+        now = time.perf_counter()
+        late = now - self.expected
+        if late > self.threshold:
+            culprit = self.slowest[1] if self.slowest else "?"
+            self.stalls.append((now - self.started, late, culprit))
+        self.slowest = None
+        self.expected = now + self.heartbeat_ms / 1000
+        try:
+            self.root.after(self.heartbeat_ms, self._beat)
+        except tk.TclError:
+            pass  # the root was destroyed
+
+    def summary(self, limit=10):
+        lines = [f"Tk profile after {time.perf_counter() - self.started:.1f} s"]
+        for title, column in (("total", 1), ("worst", 2)):
+            lines.append(f"Top callbacks by {title} time:")
+            ranked = sorted(self.stats.items(), key=lambda entry: entry[1][column], reverse=True)
+            for name, (calls, total, worst) in ranked[:limit]:
+                lines.append(f"  {total * 1000:9.1f} ms total {worst * 1000:8.1f} ms worst {calls:6d} calls  {name}")
+        lines.append(f"{len(self.stalls)} main loop stalls over {self.threshold * 1000:.0f} ms")
+        for at, seconds, culprit in sorted(self.stalls, key=lambda stall: stall[1], reverse=True)[:limit]:
+            lines.append(f"  {seconds * 1000:9.1f} ms at {at:7.1f} s, slowest callback: {culprit}")
+        return "\n".join(lines)
+
+    def dump(self):
+        print(self.summary(), file=self.out or sys.stderr)
+
+
+def profile_from_env(root):
+    """Install and start a TkProfiler when BREWERY_PROFILE is set (its value may be the stall threshold in ms)."""
+    value = os.environ.get(PROFILE_ENV, "")
+    if value in ("", "0"):
+        return None
+    threshold = int(value) if value.isdigit() and int(value) > 1 else STALL_THRESHOLD_MS
+    profiler = TkProfiler(threshold)
+    profiler.install()
+    profiler.watch(root)
+    return profiler
@@ -0,0 +1,158 @@
+import sys
+import argparse
+
+import numpy as np
+
+###############################################################
+# Brew quality simulator.
+#
+# Estimates the 0-10 quality BreweryX gives a brew when the
+# player is off by some amount: minutes of cooking, distill runs,
+# years of aging, the wrong barrel wood and wrong ingredient
+# amounts. Every deviation is one axis of a NumPy grid and each
+# quality component is computed once per axis and broadcast, so
+# the whole grid costs a few array operations per recipe.
+#
+#   python quality.py config.yml [--threshold 6]
+###############################################################
+
+AXES = ("cook", "distill", "age", "wood", "amount")
+# Offsets from the recipe's value; wood is "wrong barrel" or not.
+DEFAULT_RANGES = {
+    "cook": range(-5, 6),
+    "distill": range(-1, 3),
+    "age": range(-3, 4),
+    "wood": (False, True),
+    "amount": range(-2, 3),
+}
+# Used when a recipe has no (valid) difficulty.
+DEFAULT_DIFFICULTY = 5
+
+
+def _int(value, default=0):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _round(values):
+    # Java's Math.round rounds halves up; numpy rounds them to even.
+    return np.floor(values + 0.5)
+
+
+def allowed_diff(target, difficulty):
+    """How far a cooking time or ingredient count may be off before quality hits 0."""
+    allowed = _round((11 - difficulty) * np.maximum(target, 8) / 10)
+    return np.maximum(allowed, 1)
+
+
+class QualityGrid:
+    """Simulated qualities; quality[i, j, ...] belongs to axes[AXES[0]][i], axes[AXES[1]][j], ..."""
+
+    def __init__(self, axes, quality):
+        self.axes = axes
+        self.quality = quality
+
+    def _origin(self, name):
+        # Index of "no deviation" on an axis.
+        hits = np.flatnonzero(self.axes[name] == 0)
+        return int(hits[0]) if hits.size else 0
+
+    def at(self, **offsets):
+        """Quality for the given offsets (e.g. cook=2); other axes have no deviation."""
+        index = []
+        for name in AXES:
+            if name in offsets:
+                hits = np.flatnonzero(self.axes[name] == offsets[name])
+                if not hits.size:
+                    raise KeyError(f"{name}={offsets[name]} is not on the grid")
+                index.append(int(hits[0]))
+            else:
+                index.append(self._origin(name))
+        return int(self.quality[tuple(index)])
+
+    def forgiveness(self, threshold=6):
+        """Share of the grid that still brews at threshold quality or better."""
+        return float(np.mean(self.quality >= threshold))
+
+    def table(self, rows, columns):
+        """2D slice of the grid over two axes, the others held at no deviation."""
+        index = tuple(slice(None) if name in (rows, columns) else self._origin(name) for name in AXES)
+        table = self.quality[index]
+        return table if AXES.index(rows) < AXES.index(columns) else table.T
+
+
+def simulate(recipe, **ranges):
+    """Return the QualityGrid of recipe over the deviation ranges (DEFAULT_RANGES by default).
+
+    Axes a recipe does not use (distilling, aging, a barrel wood, ingredients)
+    collapse to no deviation.
+    """
+    difficulty = min(max(_int(recipe.difficulty, DEFAULT_DIFFICULTY), 1), 10)
+    cook_time = max(_int(recipe.cookingtime, 1), 1)
+    runs = max(_int(recipe.distillruns), 0)
+    age = max(_int(recipe.age), 0)
+    amounts = np.array([ingredient.amount or 1 for ingredient in recipe.ingredients])
+    unused = {
+        "distill": not runs,
+        "age": not age,
+        "wood": not age or str(recipe.wood or 0).strip() in ("0", ""),
+        "amount": not amounts.size,
+    }
+
+    axes = {}
+    grids = {}
+    for position, name in enumerate(AXES):
+        values = (0,) if unused.get(name) else ranges.get(name, DEFAULT_RANGES[name])
+        axes[name] = np.array(values, dtype=bool if name == "wood" else int)
+        shape = [1] * len(AXES)
+        shape[position] = -1
+        grids[name] = axes[name].reshape(shape)
+
+    components = []
+    if amounts.size:
+        # Every ingredient is off by the same count, never below one item.
+        actual = np.maximum(amounts[:, None] + axes["amount"][None, :], 1)
+        penalty = (np.abs(actual - amounts[:, None]) / allowed_diff(amounts, difficulty)[:, None] * 10).sum(axis=0)
+        components.append(10 - _round(penalty).reshape(grids["amount"].shape))
+    cooked = np.maximum(cook_time + grids["cook"], 0)
+    components.append(10 - _round(np.abs(cooked - cook_time) / allowed_diff(cook_time, difficulty) * 10))
+    if runs:
+        distilled = np.maximum(runs + grids["distill"], 0)
+        components.append(10 - _round(np.abs(distilled - runs) * difficulty / 2))
+    if age:
+        aged = np.maximum(age + grids["age"], 0)
+        components.append(10 - _round(np.abs(aged - age) * difficulty / 2))
+        components.append(np.where(grids["wood"], 10 - difficulty, 10))
+
+    shape = tuple(len(axes[name]) for name in AXES)
+    total = np.zeros(shape)
+    for component in components:
+        total = total + np.maximum(component, 0)
+    quality = np.clip(_round(total / len(components)), 0, 10).astype(np.int8)
+    return QualityGrid(axes, quality)
+
+
+def main(argv=None):
+    from config_import import ConfigImportError, iter_config_recipes
+
+    parser = argparse.ArgumentParser(description="Estimate how forgiving each recipe of a BreweryX config is.")
+    parser.add_argument("config", help="BreweryX config.yml")
+    parser.add_argument("--threshold", type=int, default=6,
+                        help="quality that still counts as a good brew (default: 6)")
+    args = parser.parse_args(argv)
+
+    try:
+        for key, recipe, _ in iter_config_recipes(args.config):
+            grid = simulate(recipe)
+            print(f"{key}: best {grid.at()}, {grid.forgiveness(args.threshold):.0%} of deviations "
+                  f"reach {args.threshold}")
+    except (OSError, ConfigImportError) as e:
+        print(f"{args.config}: {e}", file=sys.stderr)
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
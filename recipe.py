@@ -0,0 +1,334 @@
+import io
+import re
+from dataclasses import dataclass
+from typing import NamedTuple, Optional
+
+###############################################################
+# Headless BreweryX recipe model and YAML emitter.
+#
+# Nothing here imports tkinter, so recipes can be built,
+# serialized and checked by the editors and by batch tools alike.
+###############################################################
+
+
+class Ingredient(NamedTuple):
+    name: str
+    amount: Optional[int] = None
+
+    def __str__(self):
+        return self.name if self.amount is None else f"{self.name}/{self.amount}"
+
+
+class Effect(NamedTuple):
+    name: str
+    level: Optional[str] = None
+    duration: Optional[str] = None
+
+    @classmethod
+    def parse(cls, text):
+        """Parse 'NAME', 'NAME/duration' ('NAME/level' for instant effects) or 'NAME/level/duration'.
+
+        A single number after the name is read the way BreweryX reads it.
+        """
+        parts = [part.strip() for part in text.strip().split("/", 2)]
+        if len(parts) == 2 and parts[0].upper() not in INSTANT_EFFECTS:
+            return cls(parts[0], None, parts[1])
+        return cls(*parts)
+
+    def __str__(self):
+        return "/".join(str(part) for part in self if part not in (None, ""))
+
+
+# Potion effects offered by the effect selector (Bukkit PotionEffectType names).
+POTION_EFFECTS = (
+    "ABSORPTION",
+    "BAD_OMEN",
+    "BLINDNESS",
+    "CONDUIT_POWER",
+    "DARKNESS",
+    "DOLPHINS_GRACE",
+    "FIRE_RESISTANCE",
+    "GLOWING",
+    "HASTE",
+    "HEALTH_BOOST",
+    "HERO_OF_THE_VILLAGE",
+    "HUNGER",
+    "INFESTED",
+    "INSTANT_DAMAGE",
+    "INSTANT_HEALTH",
+    "INVISIBILITY",
+    "JUMP_BOOST",
+    "LEVITATION",
+    "LUCK",
+    "MINING_FATIGUE",
+    "NAUSEA",
+    "NIGHT_VISION",
+    "OOZING",
+    "POISON",
+    "RAID_OMEN",
+    "REGENERATION",
+    "RESISTANCE",
+    "SATURATION",
+    "SLOW_FALLING",
+    "SLOWNESS",
+    "SPEED",
+    "STRENGTH",
+    "TRIAL_OMEN",
+    "UNLUCK",
+    "WATER_BREATHING",
+    "WEAKNESS",
+    "WEAVING",
+    "WIND_CHARGED",
+    "WITHER",
+)
+
+# Effects that take no duration (current and legacy names); BreweryX reads
+# "NAME/n" as their level, and as the duration of every other effect.
+INSTANT_EFFECTS = frozenset({"INSTANT_HEALTH", "INSTANT_DAMAGE", "SATURATION", "HEAL", "HARM"})
+
+# Fields written after the name, in output order. Lists are written as
+# YAML sequences, everything else as a single scalar.
+SCALAR_FIELDS = ("cookingtime", "distillruns", "distilltime", "color", "difficulty", "alcohol", "wood", "age")
+LIST_FIELDS = ("lore", "servercommands", "playercommands")
+MESSAGE_FIELDS = ("drinkmessage", "drinktitle")
+
+
+@dataclass(frozen=True)
+class Recipe:
+    """One BreweryX brewing recipe; names holds the (bad, normal, good) variants."""
+
+    names: tuple
+    ingredients: tuple = ()
+    cookingtime: object = None
+    distillruns: object = None
+    distilltime: object = None
+    color: Optional[str] = None
+    difficulty: object = None
+    alcohol: object = None
+    wood: object = None
+    age: object = None
+    lore: tuple = ()
+    servercommands: tuple = ()
+    playercommands: tuple = ()
+    drinkmessage: Optional[str] = None
+    drinktitle: Optional[str] = None
+    glint: bool = False
+    effects: tuple = ()
+    # Key under "recipes:"; derived from the normal name when empty.
+    key: Optional[str] = None
+
+    @property
+    def name(self):
+        return "/".join(name or "" for name in self.names)
+
+
+###############################################################
+# YAML output.
+###############################################################
+_PLAIN_SCALAR = re.compile(r"[A-Za-z0-9_+(.$/\\][^\x00-\x1f]*")
+_NUMBER = re.compile(r"-?\d+(\.\d+)?")
+_YAML_WORDS = {"true", "false", "yes", "no", "on", "off", "null", "~", "y", "n"}
+# SnakeYAML resolves YAML 1.1 implicit types: besides plain numbers,
+# "12:30" (sexagesimal), "0x1A", "1_000", ".5", "+5" and "2024-01-01"
+# are not strings. All of them start with one of these.
+_IMPLICIT_START = tuple("0123456789+-.")
+_COLOR_CODE = re.compile(r"&(#[0-9A-Fa-f]{6}|[0-9A-Za-z])")
+
+
+def quote(value):
+    """Single-quote value for YAML, doubling embedded quotes."""
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def scalar(value, keep_string=False):
+    """Format value as a YAML scalar, quoting only when YAML would misread it.
+
+    With keep_string, text that YAML could resolve to a number, date or
+    time (e.g. a lore line "12" or "12:30") is quoted so it stays a string.
+    """
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return str(value)
+    text = str(value)
+    if keep_string and text.startswith(_IMPLICIT_START):
+        return quote(text)
+    if _NUMBER.fullmatch(text):
+        return quote(text) if keep_string else text
+    if (_PLAIN_SCALAR.fullmatch(text) and not text.endswith((" ", ":")) and ": " not in text
+            and " #" not in text and text.lower() not in _YAML_WORDS):
+        return text
+    return quote(text)
+
+
+def recipe_key(recipe):
+    """Key for recipe under "recipes:"; color codes are dropped from the name."""
+    if recipe.key:
+        return recipe.key
+    name = _COLOR_CODE.sub("", recipe.names[1] if len(recipe.names) > 1 else recipe.names[0])
+    # \W keeps letters of any script, so names without ASCII letters
+    # (a zh-CN server's) still get distinct keys.
+    return re.sub(r"\W+", "_", name.casefold()).strip("_") or "recipe"
+
+
+def _write_scalar(recipe, field, write, pad):
+    value = getattr(recipe, field)
+    if value not in (None, ""):
+        # Hex colors would otherwise be read as numbers.
+        write(f"{pad}{field}: {quote(value) if field == 'color' else scalar(value)}\n")
+
+
+def _write_list(recipe, field, write, pad):
+    entries = getattr(recipe, field)
+    if entries:
+        item_pad = pad + "  - "
+        keep_string = ENTRY_FIELDS[field]
+        write(f"{pad}{field}:\n")
+        for entry in entries:
+            write(f"{item_pad}{scalar(entry, keep_string)}\n")
+
+
+def _write_message(recipe, field, write, pad):
+    value = getattr(recipe, field)
+    if value:
+        write(f"{pad}{field}: {scalar(value, True)}\n")
+
+
+def _write_name(recipe, field, write, pad):
+    write(f"{pad}name: {quote(recipe.name)}\n")
+
+
+def _write_glint(recipe, field, write, pad):
+    if recipe.glint:
+        write(f"{pad}glint: true\n")
+
+
+# Fields written as a sequence with one line per entry, and whether
+# numeric-looking entries are quoted so they stay strings (lore and
+# commands may be "12"; ingredients and effects are names).
+ENTRY_FIELDS = {"ingredients": False, "effects": False, **dict.fromkeys(LIST_FIELDS, True)}
+
+# Writer of every Recipe field, in output order. Each field is written as its
+# own section of lines, so a preview can re-render one at a time.
+SECTION_WRITERS = {
+    "names": _write_name,
+    "ingredients": _write_list,
+    **dict.fromkeys(SCALAR_FIELDS, _write_scalar),
+    **dict.fromkeys(LIST_FIELDS, _write_list),
+    **dict.fromkeys(MESSAGE_FIELDS, _write_message),
+    "glint": _write_glint,
+    "effects": _write_list,
+}
+SECTION_FIELDS = tuple(SECTION_WRITERS)
+
+
+def write_recipe(recipe, out, indent=0):
+    """Stream the body of one recipe to out (anything with a write method)."""
+    pad = " " * indent
+    write = out.write
+    for field, writer in SECTION_WRITERS.items():
+        writer(recipe, field, write, pad)
+
+
+def section_to_yaml(recipe, field, indent=0):
+    """The YAML lines of one field of recipe, "" if it is empty."""
+    parts = []
+    SECTION_WRITERS[field](recipe, field, parts.append, " " * indent)
+    return "".join(parts)
+
+
+def common_ends(old, new):
+    """(head, tail): how many entries old and new share at the start and at the end."""
+    head = 0
+    limit = min(len(old), len(new))
+    while head < limit and old[head] == new[head]:
+        head += 1
+    tail = 0
+    while tail < limit - head and old[-1 - tail] == new[-1 - tail]:
+        tail += 1
+    return head, tail
+
+
+def entry_to_yaml(field, entry, indent=0):
+    """The YAML line of one entry of an ENTRY_FIELDS field."""
+    return f"{' ' * indent}  - {scalar(entry, ENTRY_FIELDS[field])}\n"
+
+
+def write_recipes(recipes, out):
+    """Stream a complete "recipes:" section; duplicate keys get a numeric suffix."""
+    out.write("recipes:\n")
+    used = set()
+    for recipe in recipes:
+        key = base = recipe_key(recipe)
+        suffix = 2
+        while key in used:
+            key = f"{base}_{suffix}"
+            suffix += 1
+        used.add(key)
+        out.write(f"  {key}:\n")
+        write_recipe(recipe, out, indent=4)
+
+
+def recipe_to_yaml(recipe, indent=0):
+    buffer = io.StringIO()
+    write_recipe(recipe, buffer, indent)
+    return buffer.getvalue()
+
+
+###############################################################
+# Building recipes from plain data (JSON objects, CSV rows,
+# parsed config sections).
+###############################################################
+# CSV cells hold list fields as one string, one entry per line or
+# separated by LIST_SEPARATOR.
+LIST_SEPARATOR = "|"
+_TRUE_WORDS = {"true", "yes", "y", "1", "on"}
+
+
+def parse_ingredient(text):
+    """Parse 'name/amount' (or just 'name') into an Ingredient."""
+    text = str(text).strip()
+    name, sep, amount = text.rpartition("/")
+    if sep and amount.strip().isdigit():
+        return Ingredient(name.strip(), int(amount))
+    return Ingredient(text)
+
+
+def split_list(value):
+    """Normalize a list field that may be a list, a multi-line string or a CSV cell."""
+    if value is None or value == "":
+        return ()
+    if isinstance(value, (list, tuple)):
+        return tuple(str(entry) for entry in value)
+    text = str(value)
+    separator = "\n" if "\n" in text else LIST_SEPARATOR
+    return tuple(entry.strip() for entry in text.split(separator) if entry.strip())
+
+
+def recipe_from_dict(data, key=None):
+    """Build a Recipe from a mapping using the BreweryX field names.
+
+    The name is either name: 'bad/normal/good' or separate bad/normal/good
+    entries; list fields accept anything split_list understands.
+    """
+    if data.get("name"):
+        names = tuple(part.strip() for part in str(data["name"]).split("/"))
+    else:
+        names = tuple(str(data.get(field) or "") for field in ("bad", "normal", "good"))
+    fields = {}
+    for field in SCALAR_FIELDS + MESSAGE_FIELDS:
+        value = data.get(field)
+        if value not in (None, ""):
+            fields[field] = value
+    glint = data.get("glint")
+    return Recipe(
+        names=names,
+        ingredients=tuple(parse_ingredient(entry) for entry in split_list(data.get("ingredients"))),
+        lore=split_list(data.get("lore")),
+        servercommands=split_list(data.get("servercommands")),
+        playercommands=split_list(data.get("playercommands")),
+        glint=glint if isinstance(glint, bool) else str(glint).strip().lower() in _TRUE_WORDS,
+        effects=tuple(Effect.parse(str(entry)) for entry in split_list(data.get("effects"))),
+        key=key or data.get("key") or None,
+        **fields,
+    )
@@ -0,0 +1,245 @@
+import heapq
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from itertools import islice
+
+###############################################################
+# Search helpers shared by the item and effect selectors.
+###############################################################
+
+# Separates the searchable fields of one record inside its key. Search terms
+# come from an Entry widget and never contain it, so no match can span fields.
+FIELD_SEPARATOR = "\n"
+# Characters after which a new word starts ("polished_granite", "Polished Granite").
+WORD_SEPARATORS = " _:-"
+
+# Ranking scores; each key scores by its best field.
+SCORE_EXACT = 1000
+SCORE_PREFIX = 800
+SCORE_WORD = 600
+SCORE_SUBSTRING = 400
+SCORE_FUZZY = 200
+TYPO_PENALTY = 50
+
+
+def item_search_key(item):
+    """Lowercased name and displayName of a catalog record, joined for indexing."""
+    name = item.get("name", "")
+    return FIELD_SEPARATOR.join((name, item.get("displayName", name))).lower()
+
+
+class NGramIndex:
+    """Inverted index from every 1- to 3-character substring to record positions.
+
+    Terms of up to three characters are answered straight from one posting
+    list. Longer terms start from the shortest posting list among their
+    trigrams and only those candidates are checked with a substring test, so
+    the cost follows the number of plausible matches, not the catalog size.
+    rank() builds a scored, typo-tolerant top-k on the same postings.
+    patched() derives the index of a slightly different key list, and
+    dump()/load() turn it into plain data for a cache and back.
+    """
+
+    GRAM_SIZE = 3
+
+    def __init__(self, keys):
+        self.keys = tuple(keys)
+        postings = {}
+        for position, key in enumerate(self.keys):
+            for gram in self._grams(key):
+                postings.setdefault(gram, []).append(position)
+        # Positions were appended in ascending order, so every list is sorted.
+        self.postings = {gram: tuple(positions) for gram, positions in postings.items()}
+        self.fields = tuple(tuple(key.split(FIELD_SEPARATOR)) for key in self.keys)
+        # Positions of keys that patched() took out; they stay in keys.
+        self.removed = frozenset()
+
+    @classmethod
+    def for_items(cls, items, key=item_search_key):
+        return cls(key(item) for item in items)
+
+    def dump(self):
+        """Keys and posting lists as picklable data; a posting is a compact array."""
+        return {"keys": self.keys, "removed": self.removed,
+                "postings": {gram: array("I", posting) for gram, posting in self.postings.items()}}
+
+    @classmethod
+    def load(cls, data):
+        """The index dump() was called on.
+
+        The arrays are used as posting lists as they are; converting them to
+        tuples would cost a good part of building the index again.
+        """
+        index = cls(())
+        index.keys = tuple(data["keys"])
+        index.postings = data["postings"]
+        index.fields = tuple(tuple(key.split(FIELD_SEPARATOR)) for key in index.keys)
+        index.removed = frozenset(data["removed"])
+        return index
+
+    def _grams(self, key):
+        grams = set()
+        for n in range(1, self.GRAM_SIZE + 1):
+            for start in range(len(key) - n + 1):
+                grams.add(key[start:start + n])
+        return grams
+
+    def __len__(self):
+        return len(self.keys) - len(self.removed)
+
+    def patched(self, removed=(), added=()):
+        """Return an index of these keys without the positions in removed and with added appended.
+
+        Positions do not move: removed keys stay in keys but leave every
+        posting list, and added keys get the positions after the last one.
+        Only the posting lists of grams in removed or added keys are rebuilt;
+        every other one is shared with this index, so a small change costs a
+        fraction of indexing every key again.
+        """
+        removed = frozenset(removed) - self.removed
+        added = tuple(added)
+        dropped = {}
+        for position in removed:
+            for gram in self._grams(self.keys[position]):
+                dropped.setdefault(gram, set()).add(position)
+        appended = {}
+        for position, key in enumerate(added, start=len(self.keys)):
+            for gram in self._grams(key):
+                appended.setdefault(gram, []).append(position)
+        postings = dict(self.postings)
+        for gram in dropped.keys() | appended.keys():
+            posting = postings.get(gram, ())
+            if gram in dropped:
+                # Copy the runs between removed positions in bulk; even the
+                # lists of single letters then cost little to patch.
+                kept, start = [], 0
+                for position in sorted(dropped[gram]):
+                    end = bisect_left(posting, position, start)
+                    kept += posting[start:end]
+                    start = end + 1
+                kept += posting[start:]
+                posting = kept
+            # tuple() also copies posting lists that load() left as arrays.
+            posting = tuple(posting) + tuple(appended.get(gram, ()))
+            if posting:
+                postings[gram] = posting
+            else:
+                postings.pop(gram, None)
+        index = NGramIndex(())
+        index.keys = self.keys + added
+        index.postings = postings
+        index.fields = self.fields + tuple(tuple(key.split(FIELD_SEPARATOR)) for key in added)
+        index.removed = self.removed | removed
+        return index
+
+    def _all(self):
+        if not self.removed:
+            return range(len(self.keys))
+        return [position for position in range(len(self.keys)) if position not in self.removed]
+
+    def search(self, term):
+        """Return the ascending positions of every key containing term."""
+        term = term.lower()
+        if not term:
+            return self._all()
+        if len(term) <= self.GRAM_SIZE:
+            return self.postings.get(term, ())
+        candidates = None
+        size = self.GRAM_SIZE
+        for start in range(len(term) - size + 1):
+            posting = self.postings.get(term[start:start + size])
+            if posting is None:
+                return ()
+            if candidates is None or len(posting) < len(candidates):
+                candidates = posting
+        keys = self.keys
+        return [position for position in candidates if term in keys[position]]
+
+    # Typos are only tolerated in terms at least this long, one per
+    # TYPO_LENGTH characters.
+    FUZZY_MIN_LENGTH = 4
+    TYPO_LENGTH = 4
+    # At most this many typo matches are added, and at most FUZZY_CANDIDATES
+    # times as many keys get the (comparatively slow) edit distance check.
+    FUZZY_RESULTS = 20
+    FUZZY_CANDIDATES = 4
+
+    def rank(self, term, limit):
+        """Return the positions of the best limit matches for term, best first.
+
+        Keys containing term score by where it occurs (whole field, prefix,
+        word start, anywhere). If that leaves fewer than limit hits, up to
+        FUZZY_RESULTS keys within a few typos of term are added with a lower
+        score. Only the top limit are kept, through a heap, so the cost does
+        not include sorting every match.
+        """
+        term = term.lower()
+        if not term:
+            if not self.removed:
+                return range(min(limit, len(self.keys)))
+            return list(islice(self._all(), limit))
+        fields = self.fields
+        keys = self.keys
+        exact = self.search(term)
+        scored = [(self._exact_score(term, fields[position]), -len(keys[position]), -position)
+                  for position in exact]
+        if len(scored) < limit and len(term) >= self.FUZZY_MIN_LENGTH:
+            scored += self._fuzzy(term, set(exact), min(limit - len(scored), self.FUZZY_RESULTS))
+        return [-position for _, _, position in heapq.nlargest(limit, scored)]
+
+    def _exact_score(self, term, fields):
+        best = 0
+        for field in fields:
+            if field == term:
+                return SCORE_EXACT
+            if field.startswith(term):
+                best = SCORE_PREFIX
+                continue
+            start = field.find(term)
+            while start > 0 and best < SCORE_WORD:
+                if field[start - 1] in WORD_SEPARATORS:
+                    best = SCORE_WORD
+                    break
+                start = field.find(term, start + 1)
+            if start != -1:
+                best = max(best, SCORE_SUBSTRING)
+        return best
+
+    def _fuzzy(self, term, exclude, limit):
+        """Score keys within the allowed number of typos of term."""
+        max_typos = len(term) // self.TYPO_LENGTH
+        # Count shared bigrams to pick the few keys worth an edit distance check.
+        counts = Counter()
+        for start in range(len(term) - 1):
+            counts.update(self.postings.get(term[start:start + 2], ()))
+        for position in exclude:
+            counts.pop(position, None)
+        # A substring within max_typos edits still shares this many bigrams.
+        needed = max(1, len(term) - 1 - 2 * max_typos)
+        best = heapq.nlargest(limit * self.FUZZY_CANDIDATES,
+                              (item for item in counts.items() if item[1] >= needed),
+                              key=lambda item: item[1])
+        scored = []
+        closest = 0
+        for position, _ in best:
+            typos = min(_substring_distance(term, field, max_typos) for field in self.fields[position])
+            if typos <= max_typos:
+                scored.append((SCORE_FUZZY - TYPO_PENALTY * typos, -len(self.keys[position]), -position))
+                closest += typos == 1
+                if closest >= limit:
+                    break  # nothing left can beat a single typo
+        return scored
+
+
+def _substring_distance(term, text, limit):
+    """Fewest edits turning term into some substring of text; limit + 1 once it exceeds limit."""
+    previous = [0] * (len(text) + 1)
+    for i, char in enumerate(term, start=1):
+        current = [i]
+        for j, other in enumerate(text, start=1):
+            current.append(min(previous[j - 1] + (char != other), previous[j] + 1, current[j - 1] + 1))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return min(previous)
@@ -0,0 +1,174 @@
+import re
+import sys
+from typing import NamedTuple
+
+from catalog import is_vanilla_name, normalize_name
+from recipe import POTION_EFFECTS
+
+###############################################################
+# Batch recipe validation.
+#
+# All lookups are prepared once in RecipeValidator, so checking a
+# recipe is a handful of set/dict hits and compiled regex matches.
+###############################################################
+
+# Pre-1.20.5 Bukkit names that BreweryX still accepts.
+LEGACY_EFFECT_NAMES = {
+    "CONFUSION": "NAUSEA",
+    "DAMAGE_RESISTANCE": "RESISTANCE",
+    "FAST_DIGGING": "HASTE",
+    "HARM": "INSTANT_DAMAGE",
+    "HEAL": "INSTANT_HEALTH",
+    "INCREASE_DAMAGE": "STRENGTH",
+    "JUMP": "JUMP_BOOST",
+    "SLOW": "SLOWNESS",
+    "SLOW_DIGGING": "MINING_FATIGUE",
+}
+
+# "3" or "1-3"; both bounds are captured.
+_RANGE = re.compile(r"\s*(\d+)\s*(?:-\s*(\d+)\s*)?")
+_COLOR = re.compile(r"[0-9A-Fa-f]{6}|[A-Z_]+")
+
+# field -> (minimum, maximum); None leaves that side open.
+NUMBER_FIELDS = {
+    "cookingtime": (1, None),
+    "distillruns": (0, None),
+    "distilltime": (0, None),
+    "difficulty": (1, 10),
+    "alcohol": (None, None),
+    "age": (0, None),
+}
+
+
+class Problem(NamedTuple):
+    location: str
+    field: str
+    message: str
+
+    def __str__(self):
+        return f"{self.location}: {self.field}: {self.message}"
+
+
+def parse_range(text, minimum=0):
+    """Parse 'n' or 'a-b' into (low, high); raise ValueError if malformed or decreasing."""
+    match = _RANGE.fullmatch(str(text))
+    if not match:
+        raise ValueError(f"'{text}' is not a number or a range like 1-3")
+    low = int(match.group(1))
+    high = int(match.group(2)) if match.group(2) is not None else low
+    if low < minimum:
+        raise ValueError(f"'{text}' must be at least {minimum}")
+    if high < low:
+        raise ValueError(f"range '{text}' is decreasing")
+    return low, high
+
+
+class RecipeValidator:
+    """Checks recipes against a catalog's ingredient names and the effect table.
+
+    known_names is a set of normalized names (e.g. Catalog.by_name); pass
+    None to skip the ingredient lookup when no catalog is available.
+    """
+
+    def __init__(self, known_names=None, effects=POTION_EFFECTS):
+        self.known_names = frozenset(known_names) if known_names is not None else None
+        self.effects = frozenset(effects) | frozenset(LEGACY_EFFECT_NAMES)
+
+    def validate(self, recipe, location=None):
+        """Return every Problem found in one recipe."""
+        location = location or recipe.key or recipe.name
+        problems = []
+        add = problems.append
+
+        if len(recipe.names) not in (1, 3):
+            add(Problem(location, "name", "expected one name or bad/normal/good"))
+        if not any(recipe.names):
+            add(Problem(location, "name", "missing"))
+
+        if not recipe.ingredients:
+            add(Problem(location, "ingredients", "no ingredients"))
+        known = self.known_names
+        for ingredient in recipe.ingredients:
+            if known is not None and is_vanilla_name(ingredient.name) \
+                    and normalize_name(ingredient.name) not in known:
+                add(Problem(location, "ingredients", f"unknown ingredient '{ingredient.name}'"))
+            if ingredient.amount is not None and ingredient.amount < 1:
+                add(Problem(location, "ingredients", f"'{ingredient}' needs an amount of at least 1"))
+
+        for field, (minimum, maximum) in NUMBER_FIELDS.items():
+            value = getattr(recipe, field)
+            if value in (None, ""):
+                continue
+            try:
+                number = int(value)
+            except (TypeError, ValueError):
+                add(Problem(location, field, f"'{value}' is not a whole number"))
+                continue
+            if (minimum is not None and number < minimum) or (maximum is not None and number > maximum):
+                bounds = f"{minimum if minimum is not None else ''}..{maximum if maximum is not None else ''}"
+                add(Problem(location, field, f"{number} is outside {bounds}"))
+
+        if recipe.distilltime not in (None, "") and recipe.distillruns in (None, "", 0, "0"):
+            add(Problem(location, "distilltime", "set without distillruns"))
+        if recipe.color not in (None, "") and not _COLOR.fullmatch(str(recipe.color)):
+            add(Problem(location, "color", f"'{recipe.color}' is neither a hex color nor a color name"))
+
+        effects = self.effects
+        for effect in recipe.effects:
+            name = str(effect.name).upper()
+            if name not in effects:
+                add(Problem(location, "effects", f"unknown effect '{effect.name}'"))
+            for part, minimum in (("level", 1), ("duration", 0)):
+                value = getattr(effect, part)
+                if value in (None, ""):
+                    continue
+                try:
+                    parse_range(value, minimum)
+                except ValueError as e:
+                    add(Problem(location, "effects", f"{effect.name} {part}: {e}"))
+        return problems
+
+    def validate_all(self, recipes):
+        """Validate (location, recipe) pairs in one pass, including duplicate keys."""
+        problems = []
+        seen = {}
+        for location, recipe in recipes:
+            problems += self.validate(recipe, location)
+            if recipe.key:
+                if recipe.key in seen:
+                    problems.append(Problem(location, "key", f"duplicate of {seen[recipe.key]}"))
+                else:
+                    seen[recipe.key] = location
+        return problems
+
+
+def main(argv=None):
+    """Validate the recipes: section of each config file given on the command line.
+
+    Ingredient clashes between recipes are reported alongside the problems.
+    """
+    from catalog import load_all_items
+    from collisions import find_collisions
+    from config_import import ConfigImportError, iter_config_recipes
+
+    paths = sys.argv[1:] if argv is None else argv
+    catalog = load_all_items()
+    validator = RecipeValidator(catalog.by_name if catalog.items else None)
+    count = 0
+    for path in paths:
+        try:
+            recipes = [(f"{path}:{line_number} ({key})", recipe)
+                       for key, recipe, line_number in iter_config_recipes(path)]
+        except (OSError, ConfigImportError) as e:
+            print(f"{path}: {e}", file=sys.stderr)
+            count += 1
+            continue
+        problems = validator.validate_all(recipes) + find_collisions(recipes)
+        for problem in problems:
+            print(problem)
+        count += len(problems)
+    return 1 if count else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
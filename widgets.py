@@ -0,0 +1,377 @@
+import queue
+import threading
+import tkinter as tk
+from tkinter import ttk
+from recipe import ENTRY_FIELDS, SECTION_FIELDS, common_ends, entry_to_yaml, section_to_yaml
+
+###############################################################
+# Tk helpers shared by the item and effect selectors.
+###############################################################
+
+# How long the search box has to stay unchanged before a filter pass runs.
+SEARCH_DELAY_MS = 150
+
+
+def run_in_background(widget, work, on_done, poll_ms=50):
+    """Run work() on a daemon thread, then on_done(result, error) on the Tk thread.
+
+    error is the exception work raised, or None. on_done is skipped if
+    widget was destroyed in the meantime.
+    """
+    results = queue.Queue(maxsize=1)
+
+    def run():
+        try:
+            results.put((work(), None))
+        except Exception as e:
+            results.put((None, e))
+
+    def poll():
+        if not widget.winfo_exists():
+            return
+        try:
+            result, error = results.get_nowait()
+        except queue.Empty:
+            widget.after(poll_ms, poll)
+            return
+        on_done(result, error)
+
+    threading.Thread(target=run, daemon=True).start()
+    widget.after(poll_ms, poll)
+
+
+class IncrementalTree:
+    """Shows a changing subset of rows in a flat ttk.Treeview without rebuilding it.
+
+    Each row is inserted the first time it is shown and afterwards only
+    detached and reattached, so an update costs Tk calls in proportion to the
+    rows that appear or disappear rather than to the number of rows shown.
+    """
+
+    def __init__(self, tree, make_row):
+        # make_row(iid, index, row) inserts the row for iid at index in the root.
+        self.tree = tree
+        self.make_row = make_row
+        self.created = set()
+        self.visible = []
+
+    def show(self, rows):
+        """Display exactly the rows of the ordered mapping rows (iid -> row data)."""
+        tree = self.tree
+        wanted = list(rows)
+        wanted_set = set(wanted)
+        visible_set = set(self.visible)
+
+        removed = [iid for iid in self.visible if iid not in wanted_set]
+        if removed:
+            tree.detach(*removed)
+
+        kept = [iid for iid in self.visible if iid in wanted_set]
+        if kept != [iid for iid in wanted if iid in visible_set]:
+            # The surviving rows changed their relative order, so every row
+            # has to be placed explicitly.
+            visible_set = set()
+
+        for index, iid in enumerate(wanted):
+            if iid in visible_set:
+                continue
+            if iid in self.created:
+                tree.move(iid, "", index)
+            else:
+                self.make_row(iid, index, rows[iid])
+                self.created.add(iid)
+        self.visible = wanted
+
+    def reset(self):
+        """Forget every row, e.g. after the underlying data was replaced."""
+        existing = [iid for iid in self.created if self.tree.exists(iid)]
+        if existing:
+            self.tree.delete(*existing)
+        self.created = set()
+        self.visible = []
+
+
+class SearchScheduler:
+    """Debounces a search box and refines the previous result when possible.
+
+    Every write to variable cancels the pass still waiting in after() and
+    schedules a new one, so only the last of a burst of keystrokes is
+    filtered. search(term, candidates) must return the matches for term;
+    candidates is the previous result whenever the previous term is contained
+    in the new one (every match must then be among them), and None otherwise.
+    With refine=False (for searches returning only the best matches, which
+    a longer term can't be narrowed from) search(term) is called instead.
+    show(results) receives the matches.
+    """
+
+    def __init__(self, widget, variable, search, show, delay_ms=SEARCH_DELAY_MS, refine=True):
+        self.widget = widget
+        self.variable = variable
+        self.search = search
+        self.show = show
+        self.delay_ms = delay_ms
+        self.refine = refine
+        self.pending = None
+        self.last_term = None
+        self.last_results = None
+        variable.trace_add("write", self.schedule)
+
+    def schedule(self, *args):
+        self.cancel()
+        self.pending = self.widget.after(self.delay_ms, self.run_now)
+
+    def cancel(self):
+        if self.pending is not None:
+            self.widget.after_cancel(self.pending)
+            self.pending = None
+
+    def run_now(self):
+        self.cancel()
+        if not self.widget.winfo_exists():
+            return
+        term = self.variable.get().lower()
+        if not self.refine:
+            self.show(self.search(term))
+            return
+        candidates = None
+        if self.last_term is not None and self.last_term in term:
+            candidates = self.last_results
+        results = self.search(term, candidates)
+        self.last_term, self.last_results = term, results
+        self.show(results)
+
+    def reset(self):
+        """Drop the cached result, e.g. after the searched data changed."""
+        self.last_term = None
+        self.last_results = None
+
+
+class VirtualList(ttk.Frame):
+    """Flat list that only draws the rows currently scrolled into view.
+
+    A fixed pool of canvas items (one per visible row plus a small overscan)
+    is re-pointed at different rows as the list scrolls, so building and
+    scrolling cost the same for fifty thousand rows as for fifty. It offers
+    the parts of the ttk.Treeview interface ItemSelector relies on: show()
+    and reset() like IncrementalTree, focus() and "<Double-1>" bindings.
+    """
+
+    ROW_HEIGHT = 20
+    OVERSCAN = 2
+
+    def __init__(self, parent, describe, *args, on_view_change=None, **kwargs):
+        # describe(iid, row) returns (text, image) for a row; image may be None.
+        # on_view_change() is called whenever other rows come into view.
+        super().__init__(parent, *args, **kwargs)
+        self.describe = describe
+        self.on_view_change = on_view_change
+        self.iids = []
+        self.data = {}
+        self.top = 0
+        self.selected = None
+        self.slots = []
+
+        self.canvas = tk.Canvas(self, highlightthickness=0, background="white")
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.yview)
+        self.scrollbar.pack(side="right", fill="y")
+        self.canvas.pack(side="left", fill="both", expand=True)
+
+        self.canvas.bind("<Configure>", self._on_configure)
+        self.canvas.bind("<Button-1>", self._on_click)
+        self.canvas.bind("<MouseWheel>", self._on_wheel)
+        self.canvas.bind("<Button-4>", lambda e: self.yview("scroll", -1, "units"))
+        self.canvas.bind("<Button-5>", lambda e: self.yview("scroll", 1, "units"))
+
+    def bind(self, sequence=None, func=None, add=None):
+        # Row events happen on the canvas, so forward bindings there.
+        return self.canvas.bind(sequence, func, add)
+
+    def show(self, rows):
+        """Display the rows of the ordered mapping rows (iid -> row data)."""
+        self.data = rows
+        self.iids = list(rows)
+        if self.selected not in rows:
+            self.selected = None
+        self.top = 0
+        self._redraw()
+
+    def reset(self):
+        self.show({})
+
+    def focus(self):
+        return self.selected or ""
+
+    def refresh(self):
+        """Redraw the visible rows, e.g. after their icons changed."""
+        self._redraw()
+
+    def visible_iids(self):
+        """Rows currently drawn, including the overscan."""
+        first = max(self.top // self.ROW_HEIGHT - self.OVERSCAN, 0)
+        return self.iids[first:first + len(self.slots) + self.OVERSCAN]
+
+    def yview(self, *args):
+        total = len(self.iids) * self.ROW_HEIGHT
+        height = self.canvas.winfo_height()
+        if args and args[0] == "moveto":
+            self.top = int(float(args[1]) * total)
+        elif args and args[0] == "scroll":
+            step = self.ROW_HEIGHT if args[2] == "units" else max(height - self.ROW_HEIGHT, self.ROW_HEIGHT)
+            self.top += int(args[1]) * step
+        self.top = max(0, min(self.top, total - height))
+        self._redraw()
+
+    def _on_configure(self, event):
+        needed = event.height // self.ROW_HEIGHT + self.OVERSCAN
+        while len(self.slots) < needed:
+            self.slots.append((
+                self.canvas.create_rectangle(0, 0, 0, 0, width=0, fill=""),
+                self.canvas.create_image(2, 0, anchor="nw"),
+                self.canvas.create_text(24, 0, anchor="nw"),
+            ))
+        self.yview()
+
+    def _on_click(self, event):
+        index = (self.top + event.y) // self.ROW_HEIGHT
+        if 0 <= index < len(self.iids):
+            self.selected = self.iids[index]
+            self._redraw()
+
+    def _on_wheel(self, event):
+        self.yview("scroll", -1 if event.delta > 0 else 1, "units")
+
+    def _redraw(self):
+        canvas = self.canvas
+        width = canvas.winfo_width()
+        first, offset = divmod(self.top, self.ROW_HEIGHT)
+        for slot, (rect, image_item, text_item) in enumerate(self.slots):
+            index = first + slot
+            if index >= len(self.iids):
+                canvas.itemconfigure(rect, state="hidden")
+                canvas.itemconfigure(image_item, state="hidden")
+                canvas.itemconfigure(text_item, state="hidden")
+                continue
+            iid = self.iids[index]
+            text, image = self.describe(iid, self.data[iid])
+            y = slot * self.ROW_HEIGHT - offset
+            canvas.coords(rect, 0, y, width, y + self.ROW_HEIGHT)
+            canvas.itemconfigure(rect, state="normal", fill="#cce8ff" if iid == self.selected else "")
+            canvas.coords(image_item, 2, y + 2)
+            canvas.itemconfigure(image_item, state="normal", image=image or "")
+            canvas.coords(text_item, 24 if image else 4, y + 3)
+            canvas.itemconfigure(text_item, state="normal", text=text)
+
+        total = len(self.iids) * self.ROW_HEIGHT
+        if total:
+            height = canvas.winfo_height()
+            self.scrollbar.set(self.top / total, min((self.top + height) / total, 1.0))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+        if self.on_view_change:
+            self.on_view_change()
+
+
+class Heatmap(tk.Canvas):
+    """Grid of numbered cells shaded from red (0) through yellow to green (maximum)."""
+
+    CELL_SIZE = 28
+    LABEL_SIZE = 40
+
+    def __init__(self, parent, values, row_labels, column_labels, maximum=10, *args, **kwargs):
+        # values is a list of rows, one number per column.
+        cell, label = self.CELL_SIZE, self.LABEL_SIZE
+        kwargs.setdefault("width", label + cell * len(column_labels))
+        kwargs.setdefault("height", label + cell * len(row_labels))
+        kwargs.setdefault("background", "white")
+        kwargs.setdefault("highlightthickness", 0)
+        super().__init__(parent, *args, **kwargs)
+        for column, text in enumerate(column_labels):
+            self.create_text(label + cell * column + cell // 2, label // 2, text=str(text))
+        for row, text in enumerate(row_labels):
+            y = label + cell * row
+            self.create_text(label // 2, y + cell // 2, text=str(text))
+            for column, value in enumerate(values[row]):
+                x = label + cell * column
+                self.create_rectangle(x, y, x + cell, y + cell, fill=self.color(value / maximum), outline="white")
+                self.create_text(x + cell // 2, y + cell // 2, text=str(value))
+
+    @staticmethod
+    def color(share):
+        share = min(max(share, 0.0), 1.0)
+        red = 255 if share < 0.5 else int(255 * (1 - share) * 2)
+        green = int(255 * share * 2) if share < 0.5 else 200
+        return f"#{red:02x}{green:02x}60"
+
+
+class YamlPreview(ttk.Frame):
+    """Read-only YAML of a Recipe that is kept up to date field by field.
+
+    Each field of the recipe is a block of lines in the Text widget. show()
+    compares every field with the one on screen, first by identity (a
+    dataclasses.replace() copy shares its unchanged fields) and then by
+    value, and only the blocks that differ are rendered again. In sequences
+    (ingredients, effects, lore, commands) only the entries between the
+    unchanged head and tail are replaced, so typing in a long lore costs
+    one line of YAML per keystroke.
+    """
+
+    def __init__(self, parent, *args, indent=0, **kwargs):
+        super().__init__(parent, *args, **kwargs)
+        self.indent = indent
+        self.text = tk.Text(self, wrap="none", width=50, state="disabled")
+        vsb = ttk.Scrollbar(self, orient="vertical", command=self.text.yview)
+        self.text.configure(yscrollcommand=vsb.set)
+        vsb.pack(side="right", fill="y")
+        self.text.pack(fill="both", expand=True)
+        self.recipe = None
+        self.shown = {}                                 # field -> value on screen
+        self.line_counts = dict.fromkeys(SECTION_FIELDS, 0)
+        self.pending = None
+
+    def show(self, recipe):
+        """Display recipe once Tk is idle; a burst of edits is rendered once."""
+        self.recipe = recipe
+        if self.pending is None:
+            self.pending = self.after_idle(self.refresh)
+
+    def refresh(self):
+        self.pending = None
+        if not self.winfo_exists() or self.recipe is None:
+            return
+        recipe = self.recipe
+        text = self.text
+        text.configure(state="normal")
+        line = 1
+        for field in SECTION_FIELDS:
+            value = getattr(recipe, field)
+            shown = field in self.shown
+            old = self.shown.get(field)
+            if shown and (old is value or old == value):
+                pass
+            elif shown and field in ENTRY_FIELDS and old and value:
+                self._splice(field, line + 1, old, value)
+                self.shown[field] = value
+            else:
+                block = section_to_yaml(recipe, field, self.indent)
+                self.line_counts[field] = self._replace(line, self.line_counts[field], block)
+                self.shown[field] = value
+            line += self.line_counts[field]
+        text.configure(state="disabled")
+
+    def _replace(self, line, count, block):
+        # Swap the count lines starting at line for block.
+        if count:
+            self.text.delete(f"{line}.0", f"{line + count}.0")
+        if block:
+            self.text.insert(f"{line}.0", block)
+        return block.count("\n")
+
+    def _splice(self, field, first, old, new):
+        # Replace only the entries between the common head and tail.
+        head, tail = common_ends(old, new)
+        block = "".join(entry_to_yaml(field, entry, self.indent) for entry in new[head:len(new) - tail])
+        self._replace(first + head, len(old) - head - tail, block)
+        self.line_counts[field] += len(new) - len(old)
+
+    def get(self):
+        return self.text.get("1.0", "end-1c")